@@ -6,6 +6,7 @@
 # -- Project information -----------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#project-information
 
+import functools
 import sys
 import os
 import subprocess
@@ -13,19 +14,29 @@ import subprocess
 sys.path.insert(0, os.path.abspath('../..'))
 
 
+@functools.cache
+def _git_describe(*args):
+    """
+    Run `git describe --tags` with extra arguments.
+
+    Returns: first line of output or 'undefined'
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'describe', '--tags', *args],
+            capture_output=True, text=True, timeout=2, check=False)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return 'undefined'
+    return result.stdout.strip() or 'undefined'
+
+
 def get_git_version():
     """
     Get current version.
 
     Returns: version string
     """
-    git = subprocess.Popen(
-        ['git', 'describe', '--tags'], stdout=subprocess.PIPE)
-    result = git.stdout.readlines()
-    if len(result) > 0:
-        return result[0].decode().strip()
-    else:
-        return 'undefined'
+    return _git_describe()
 
 def get_git_release():
     """
@@ -33,13 +44,7 @@ def get_git_release():
 
     Returns: release string (latest tag)
     """
-    git = subprocess.Popen(
-        ['git', 'describe', '--tags', '--abbrev=0'], stdout=subprocess.PIPE)
-    result = git.stdout.readlines()
-    if len(result) > 0:
-        return result[0].decode().strip()
-    else:
-        return 'undefined'
+    return _git_describe('--abbrev=0')
 
 
 project = 'PumaGuard'
@@ -26,15 +26,6 @@ for _thread_env_var in (
     os.environ.setdefault(_thread_env_var, "1")
 del _thread_env_var
 
-try:
-    import setuptools
-except ModuleNotFoundError:
-    import sys
-
-    print("Unable to load setuptools")
-    print(sys.path)
-    raise
-
 try:
     __version__ = importlib.metadata.version("pumaguard")
     __VERSION__ = __version__  # Keep for backward compatibility
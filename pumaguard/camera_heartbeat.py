@@ -8,14 +8,29 @@ from __future__ import (
     annotations,
 )
 
+import asyncio
+import ipaddress
+import itertools
 import logging
+import os
+import select
+import shutil
 import socket
+import struct
 import subprocess
+import time
 from collections.abc import (
     Callable,
+    Coroutine,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
 )
 from typing import (
     TYPE_CHECKING,
+    Any,
 )
 
 from pumaguard.device_heartbeat import (
@@ -29,6 +44,81 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_PAYLOAD = b"pumaguard-heartbeat"
+
+# How long resolved camera hostnames are reused, in seconds
+DNS_CACHE_TTL = 300
+
+# SO_LINGER with a zero timeout: close() resets the connection instead of
+# leaving a socket in TIME_WAIT behind for every probe
+TCP_LINGER_RESET = struct.pack("ii", 1, 0)
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """
+    Compute the 16-bit one's complement checksum of an ICMP message.
+
+    Args:
+        data: ICMP header and payload with the checksum field set to zero
+
+    Returns:
+        The checksum value
+    """
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _build_icmp_echo(identifier: int, sequence: int) -> bytes:
+    """
+    Build an ICMP Echo Request packet.
+
+    Args:
+        identifier: Echo identifier (replaced by the kernel for
+            unprivileged datagram sockets)
+        sequence: Echo sequence number
+
+    Returns:
+        The ICMP packet including header and payload
+    """
+    header = struct.pack(
+        "!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence
+    )
+    checksum = _icmp_checksum(header + ICMP_ECHO_PAYLOAD)
+    header = struct.pack(
+        "!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, identifier, sequence
+    )
+    return header + ICMP_ECHO_PAYLOAD
+
+
+def _parse_icmp_echo_reply(packet: bytes) -> int | None:
+    """
+    Parse an ICMP Echo Reply packet.
+
+    Some platforms include the IPv4 header in packets received on ICMP
+    datagram sockets; it is stripped if present.
+
+    Args:
+        packet: Packet as received from the socket
+
+    Returns:
+        The echo sequence number, or None if the packet is not an
+        Echo Reply
+    """
+    if len(packet) >= 20 and packet[0] >> 4 == 4:
+        packet = packet[(packet[0] & 0x0F) * 4 :]
+    if len(packet) < 8:
+        return None
+    icmp_type, _, _, _, sequence = struct.unpack("!BBHHH", packet[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return sequence
+
 
 class CameraHeartbeat(DeviceHeartbeat):
     """
@@ -88,6 +178,22 @@ class CameraHeartbeat(DeviceHeartbeat):
         self.tcp_timeout = tcp_timeout
         self.icmp_timeout = icmp_timeout
 
+        # Unprivileged ICMP sockets need net.ipv4.ping_group_range to
+        # include our group; if they are not permitted we fall back to
+        # the ping command.
+        self._icmp_socket_supported = True
+        self._icmp_sequence = itertools.count(1)
+
+        # Without ICMP sockets, fping checks all cameras of a sweep in one
+        # process instead of running ping once per camera.
+        self._fping = shutil.which("fping")
+
+        # Resolved hostnames: hostname -> (IP address, resolution time)
+        self._dns_cache: dict[str, tuple[str, float]] = {}
+
+        # Camera list as last written to the settings file
+        self._saved_camera_list: list[dict] | None = None
+
         # Validate check method
         if self.check_method not in ["icmp", "tcp", "both"]:
             logger.warning(
@@ -96,10 +202,108 @@ class CameraHeartbeat(DeviceHeartbeat):
             )
             self.check_method = "tcp"
 
+    def _resolve(self, host: str) -> str | None:
+        """
+        Resolve a camera address to an IPv4 address.
+
+        IP addresses are returned unchanged. Hostnames are looked up once
+        and the result is reused for DNS_CACHE_TTL seconds, so that a
+        sweep does not query the resolver for every check.
+
+        Args:
+            host: IP address or hostname of the camera
+
+        Returns:
+            The IP address, or None if the hostname cannot be resolved
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        now = time.monotonic()
+        cached = self._dns_cache.get(host)
+        if cached is not None and now - cached[1] < DNS_CACHE_TTL:
+            return cached[0]
+
+        try:
+            addresses = socket.getaddrinfo(
+                host, None, socket.AF_INET, socket.SOCK_STREAM
+            )
+        except OSError as e:
+            logger.debug("Could not resolve %s: %s", host, str(e))
+            return None
+        ip_address = addresses[0][4][0]
+        self._dns_cache[host] = (ip_address, now)
+        return ip_address
+
     def _check_icmp(self, ip_address: str) -> bool:
         """
         Check camera availability using ICMP ping.
 
+        Sends a single ICMP Echo Request through an unprivileged ICMP
+        datagram socket. Falls back to the ping command if such sockets
+        are not permitted on this system.
+
+        Args:
+            ip_address: IP address to ping
+
+        Returns:
+            True if ping successful, False otherwise
+        """
+        if self._icmp_socket_supported:
+            try:
+                sock = socket.socket(
+                    socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP
+                )
+            except OSError as e:
+                logger.info(
+                    "ICMP sockets not available (%s), using ping command",
+                    str(e),
+                )
+                self._icmp_socket_supported = False
+            else:
+                with sock:
+                    return self._check_icmp_socket(sock, ip_address)
+        return self._check_icmp_subprocess(ip_address)
+
+    def _check_icmp_socket(self, sock: socket.socket, ip_address: str) -> bool:
+        """
+        Send an ICMP Echo Request and wait for the matching reply.
+
+        Args:
+            sock: ICMP datagram socket
+            ip_address: IP address to ping
+
+        Returns:
+            True if an Echo Reply was received in time, False otherwise
+        """
+        sequence = next(self._icmp_sequence) & 0xFFFF
+        packet = _build_icmp_echo(os.getpid() & 0xFFFF, sequence)
+        try:
+            sock.sendto(packet, (ip_address, 0))
+            deadline = time.monotonic() + self.icmp_timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                ready, _, _ = select.select([sock], [], [], remaining)
+                if not ready:
+                    return False
+                reply, address = sock.recvfrom(1024)
+                if address[0] != ip_address:
+                    continue
+                if _parse_icmp_echo_reply(reply) == sequence:
+                    return True
+        except OSError as e:
+            logger.debug("ICMP ping failed for %s: %s", ip_address, str(e))
+            return False
+
+    def _check_icmp_subprocess(self, ip_address: str) -> bool:
+        """
+        Check camera availability using the ping command.
+
         Args:
             ip_address: IP address to ping
 
@@ -122,6 +326,50 @@ class CameraHeartbeat(DeviceHeartbeat):
             logger.debug("ICMP ping failed for %s: %s", ip_address, str(e))
             return False
 
+    def _check_icmp_batch(self, ip_addresses: list[str]) -> dict[str, bool]:
+        """
+        Check several cameras with a single fping command.
+
+        Args:
+            ip_addresses: IP addresses to ping
+
+        Returns:
+            Dictionary mapping IP addresses to reachability status
+
+        Raises:
+            OSError: If fping could not be run
+            subprocess.TimeoutExpired: If fping did not finish in time
+        """
+        # -q: only print per-host summaries (to stderr)
+        # -c 1: send 1 packet to each host
+        # -t: initial timeout in milliseconds
+        result = subprocess.run(
+            [
+                self._fping or "fping",
+                "-q",
+                "-c",
+                "1",
+                "-t",
+                str(self.icmp_timeout * 1000),
+                *ip_addresses,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=self.icmp_timeout * len(ip_addresses) + 2,
+            check=False,
+        )
+        reachable = dict.fromkeys(ip_addresses, False)
+        # Summary lines look like
+        # "192.168.52.101 : xmt/rcv/%loss = 1/1/0%, min/avg/max = ..."
+        for line in result.stderr.splitlines():
+            host, separator, summary = line.partition(" : ")
+            if not separator or host.strip() not in reachable:
+                continue
+            _, _, counts = summary.partition("=")
+            received = counts.strip().split("/")[1:2]
+            reachable[host.strip()] = received not in ([], ["0"])
+        return reachable
+
     def _check_tcp(self, ip_address: str, port: int) -> bool:
         """
         Check camera availability using TCP connection test.
@@ -135,9 +383,14 @@ class CameraHeartbeat(DeviceHeartbeat):
         """
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.tcp_timeout)
-            result = sock.connect_ex((ip_address, port))
-            sock.close()
+            try:
+                sock.settimeout(self.tcp_timeout)
+                sock.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_LINGER, TCP_LINGER_RESET
+                )
+                result = sock.connect_ex((ip_address, port))
+            finally:
+                sock.close()
             return result == 0
         except (socket.error, OSError) as e:
             logger.debug(
@@ -148,16 +401,94 @@ class CameraHeartbeat(DeviceHeartbeat):
             )
             return False
 
+    async def _check_tcp_async(self, ip_address: str, port: int) -> bool:
+        """
+        Check camera availability using an asynchronous TCP connection.
+
+        Args:
+            ip_address: IP address to connect to
+            port: TCP port to connect to
+
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip_address, port), self.tcp_timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.debug(
+                "TCP connection failed for %s:%d: %s",
+                ip_address,
+                port,
+                str(e),
+            )
+            return False
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, TCP_LINGER_RESET
+            )
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def _check_tcp_sweep(
+        self, ip_addresses: dict[str, str]
+    ) -> dict[str, bool]:
+        """
+        Check all cameras concurrently using TCP connection tests.
+
+        Args:
+            ip_addresses: Dictionary mapping MAC addresses to IP addresses
+
+        Returns:
+            Dictionary mapping MAC addresses to reachability status;
+            cameras whose check failed are omitted
+        """
+        results = {}
+        resolved = {}
+        for mac_address, host in ip_addresses.items():
+            ip_address = self._resolve(host)
+            if ip_address is None:
+                results[mac_address] = False
+            else:
+                resolved[mac_address] = ip_address
+
+        mac_addresses = list(resolved)
+        outcomes = await asyncio.gather(
+            *(
+                self._check_tcp_async(resolved[mac], self.tcp_port)
+                for mac in mac_addresses
+            ),
+            return_exceptions=True,
+        )
+        for mac_address, outcome in zip(mac_addresses, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(
+                    "Error checking camera %s: %s", mac_address, str(outcome)
+                )
+                continue
+            results[mac_address] = outcome
+        return results
+
     def check_camera(self, ip_address: str) -> bool:
         """
         Check if a camera is reachable using the configured method.
 
         Args:
-            ip_address: IP address of the camera
+            ip_address: IP address or hostname of the camera
 
         Returns:
             True if camera is reachable, False otherwise
         """
+        resolved = self._resolve(ip_address)
+        if resolved is None:
+            return False
+        ip_address = resolved
         if self.check_method == "icmp":
             return self._check_icmp(ip_address)
         if self.check_method == "tcp":
@@ -184,6 +515,161 @@ class CameraHeartbeat(DeviceHeartbeat):
         """
         return self.check_camera(ip_address)
 
+    def _check_devices(
+        self,
+        pool: ThreadPoolExecutor,
+        ip_addresses: dict[str, str],
+        check: Callable[[str], bool] | None = None,
+    ) -> dict[str, bool]:
+        """
+        Check several cameras concurrently.
+
+        TCP checks of a sweep all run on a single event loop instead of
+        occupying one pool thread per camera. When ICMP sockets are not
+        permitted, pings go through a single fping call if available.
+        With the "both" method, pings and TCP checks run at the same time.
+
+        Args:
+            pool: Thread pool used for the other check methods
+            ip_addresses: Dictionary mapping MAC addresses to IP addresses
+            check: Check to run instead of the configured method
+
+        Returns:
+            Dictionary mapping MAC addresses to reachability status
+        """
+        if check is not None:
+            return super()._check_devices(pool, ip_addresses, check)
+        if not ip_addresses:
+            return {}
+        if self.check_method == "tcp":
+            return self._run_sweep(pool, self._check_tcp_sweep, ip_addresses)
+        if self.check_method == "icmp":
+            return self._check_icmp_sweep(pool, ip_addresses)
+        return self._run_sweep(
+            pool, self._check_both_sweep, pool, ip_addresses
+        )
+
+    def _run_sweep(
+        self,
+        pool: ThreadPoolExecutor,
+        sweep: Callable[..., Coroutine[Any, Any, dict[str, bool]]],
+        *args,
+    ) -> dict[str, bool]:
+        """
+        Run an asyncio sweep on the thread pool.
+
+        The sweep runs on its own event loop in a pool thread so that
+        stop() does not have to wait for its timeouts.
+
+        Args:
+            pool: Thread pool to run the event loop on
+            sweep: Coroutine function performing the sweep
+            *args: Arguments for the sweep
+
+        Returns:
+            Dictionary mapping MAC addresses to reachability status, or
+            an empty dictionary if stop() was called first
+        """
+
+        def run() -> dict[str, bool]:
+            return asyncio.run(sweep(*args))
+
+        future = pool.submit(run)
+        done, _ = wait(
+            [future, self._stop_future], return_when=FIRST_COMPLETED
+        )
+        if future not in done:
+            future.cancel()
+            return {}
+        return future.result()
+
+    def _check_icmp_host(self, host: str) -> bool:
+        """
+        Ping a camera given by IP address or hostname.
+
+        Args:
+            host: IP address or hostname of the camera
+
+        Returns:
+            True if ping successful, False otherwise
+        """
+        ip_address = self._resolve(host)
+        if ip_address is None:
+            return False
+        return self._check_icmp(ip_address)
+
+    def _check_icmp_sweep(
+        self,
+        pool: ThreadPoolExecutor,
+        ip_addresses: dict[str, str],
+        check: Callable[[str], bool] | None = None,
+    ) -> dict[str, bool]:
+        """
+        Ping several cameras concurrently.
+
+        Args:
+            pool: Thread pool to run individual pings on
+            ip_addresses: Dictionary mapping MAC addresses to IP addresses
+            check: Per-camera check used when fping cannot be used
+                (default: check_device)
+
+        Returns:
+            Dictionary mapping MAC addresses to reachability status
+        """
+        if self._icmp_socket_supported or not self._fping:
+            return super()._check_devices(pool, ip_addresses, check)
+
+        resolved = {
+            mac_address: self._resolve(host)
+            for mac_address, host in ip_addresses.items()
+        }
+        targets = sorted({ip for ip in resolved.values() if ip is not None})
+        try:
+            reachable = self._check_icmp_batch(targets) if targets else {}
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug("fping failed, pinging cameras one by one: %s", e)
+            return super()._check_devices(pool, ip_addresses, check)
+
+        return {
+            mac_address: reachable.get(ip, False) if ip else False
+            for mac_address, ip in resolved.items()
+        }
+
+    async def _check_both_sweep(
+        self, pool: ThreadPoolExecutor, ip_addresses: dict[str, str]
+    ) -> dict[str, bool]:
+        """
+        Ping and connect to several cameras at the same time.
+
+        A camera that cannot be reached costs the longer of the two
+        timeouts instead of their sum.
+
+        Args:
+            pool: Thread pool to run individual pings on
+            ip_addresses: Dictionary mapping MAC addresses to IP addresses
+
+        Returns:
+            Dictionary mapping MAC addresses to reachability status
+        """
+        loop = asyncio.get_running_loop()
+        icmp_results, tcp_results = await asyncio.gather(
+            loop.run_in_executor(
+                None,
+                self._check_icmp_sweep,
+                pool,
+                ip_addresses,
+                self._check_icmp_host,
+            ),
+            self._check_tcp_sweep(ip_addresses),
+        )
+        results = {}
+        for mac_address in ip_addresses:
+            if mac_address in icmp_results or mac_address in tcp_results:
+                results[mac_address] = icmp_results.get(
+                    mac_address, False
+                ) or tcp_results.get(mac_address, False)
+        return results
+
     def _get_devices_dict(self) -> dict:
         """
         Get the cameras dictionary from webui.
@@ -196,19 +682,21 @@ class CameraHeartbeat(DeviceHeartbeat):
     def _save_device_list(self) -> None:
         """Save the camera list to settings file."""
         try:
-            camera_list = []
-            for _, cam_info in self.webui.cameras.items():
-                camera_list.append(
-                    {
-                        "hostname": cam_info["hostname"],
-                        "ip_address": cam_info["ip_address"],
-                        "mac_address": cam_info["mac_address"],
-                        "last_seen": cam_info["last_seen"],
-                        "status": cam_info["status"],
-                    }
-                )
+            camera_list = [
+                {
+                    "hostname": cam_info["hostname"],
+                    "ip_address": cam_info["ip_address"],
+                    "mac_address": cam_info["mac_address"],
+                    "last_seen": cam_info["last_seen"],
+                    "status": cam_info["status"],
+                }
+                for cam_info in self.webui.cameras.values()
+            ]
             self.webui.presets.cameras = camera_list
+            if camera_list == self._saved_camera_list:
+                return
             self.webui.presets.save()
+            self._saved_camera_list = [dict(cam) for cam in camera_list]
         except Exception as e:  # pylint: disable=broad-except
             logger.error("Failed to save camera list: %s", str(e))
 
@@ -231,7 +719,7 @@ class CameraHeartbeat(DeviceHeartbeat):
 
     def _update_camera_status(
         self, mac_address: str, is_reachable: bool
-    ) -> None:
+    ) -> bool:
         """
         Update camera status and last_seen timestamp.
 
@@ -241,6 +729,9 @@ class CameraHeartbeat(DeviceHeartbeat):
         Args:
             mac_address: MAC address of the camera
             is_reachable: Whether the camera is currently reachable
+
+        Returns:
+            True if the camera's status changed
         """
         return self._update_device_status(mac_address, is_reachable)
 
@@ -6,12 +6,24 @@ This script classifies images.
 
 import argparse
 import logging
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+from itertools import (
+    zip_longest,
+)
+
+from PIL import (
+    Image,
+)
 
 from pumaguard.presets import (
     Settings,
 )
 from pumaguard.utils import (
     classify_image_two_stage,
+    load_image_rgb,
 )
 
 logger = logging.getLogger("PumaGuard")
@@ -30,6 +42,19 @@ def configure_subparser(parser: argparse.ArgumentParser):
     )
 
 
+def _prefetched_image(future: Future) -> Image.Image | None:
+    """
+    Get an image decoded in the background.
+
+    Returns None if the image could not be loaded, in which case the
+    classifier loads it again and reports the error.
+    """
+    try:
+        return future.result()
+    except OSError:
+        return None
+
+
 def main(options: argparse.Namespace, presets: Settings):
     """
     Main entry point
@@ -37,14 +62,25 @@ def main(options: argparse.Namespace, presets: Settings):
 
     logger.debug("starting classify")
 
-    for image_path in options.image:
-        prediction = classify_image_two_stage(
-            presets=presets, image_path=image_path
-        )
-        if prediction >= 0:
-            print(
-                f"Predicted {image_path}: {100 * prediction:6.2f}% lion "
-                + f"({'lion' if prediction > 0.5 else 'no lion'})"
+    image_paths = list(options.image)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Decode the next image while the current one is being classified
+        pending = [
+            pool.submit(load_image_rgb, path) for path in image_paths[:1]
+        ]
+        for image_path, next_path in zip_longest(image_paths, image_paths[1:]):
+            current = pending.pop()
+            if next_path is not None:
+                pending.append(pool.submit(load_image_rgb, next_path))
+            prediction = classify_image_two_stage(
+                presets=presets,
+                image_path=image_path,
+                image=_prefetched_image(current),
             )
-        else:
-            logger.warning("predicted label < 0!")
+            if prediction >= 0:
+                print(
+                    f"Predicted {image_path}: {100 * prediction:6.2f}% lion "
+                    + f"({'lion' if prediction > 0.5 else 'no lion'})"
+                )
+            else:
+                logger.warning("predicted label < 0!")
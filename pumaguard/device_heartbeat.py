@@ -9,8 +9,10 @@ from __future__ import (
     annotations,
 )
 
+import functools
 import logging
 import threading
+import time
 from abc import (
     ABC,
     abstractmethod,
@@ -18,6 +20,12 @@ from abc import (
 from collections.abc import (
     Callable,
 )
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import (
     datetime,
     timedelta,
@@ -34,6 +42,64 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent reachability checks during a sweep
+MAX_CHECK_WORKERS = 8
+
+# How often refreshed last_seen timestamps of devices that stay connected
+# are written to the settings file, in seconds
+LAST_SEEN_SAVE_INTERVAL = 3600
+
+# Log templates for the stale device check
+_STALE_REMOVAL_FMT = (
+    "%s '%s' (%s) not seen for %.1f hours, scheduling for auto-removal"
+)
+_STALE_OFFLINE_FMT = (
+    "%s '%s' (%s) at %s has been offline for %.1f hours, "
+    "will be auto-removed in %.1f hours"
+)
+_STALE_OFFLINE_KEPT_FMT = (
+    "%s '%s' (%s) at %s has been offline for %.1f hours "
+    "(auto-removal disabled)"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _format_last_seen(seconds: int) -> str:
+    """
+    Format a Unix time as a last_seen timestamp.
+
+    All devices updated within the same second share one string.
+
+    Args:
+        seconds: Seconds since the epoch
+
+    Returns:
+        UTC timestamp such as "2024-01-15T10:00:00Z"
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_last_seen(last_seen: str) -> datetime:
+    """
+    Parse a last_seen timestamp.
+
+    Devices that stay offline keep their last_seen, so the same strings
+    are parsed on every sweep.
+
+    Args:
+        last_seen: ISO 8601 timestamp, optionally ending in "Z"
+
+    Returns:
+        Timezone aware datetime
+
+    Raises:
+        ValueError: If the timestamp cannot be parsed
+    """
+    if last_seen.endswith("Z"):
+        last_seen = last_seen[:-1] + "+00:00"
+    return datetime.fromisoformat(last_seen)
+
 
 class DeviceHeartbeat(ABC):
     """
@@ -81,9 +147,22 @@ class DeviceHeartbeat(ABC):
         self.auto_remove_enabled = auto_remove_enabled
         self.auto_remove_hours = auto_remove_hours
 
+        # Names used in log messages and status change events
+        self._device_name = device_type.capitalize()
+        self._online_event = f"{device_type}_status_changed_online"
+        self._offline_event = f"{device_type}_status_changed_offline"
+        self._removed_event = f"{device_type}_removed"
+
         self._running = False
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
+        # Set by trigger_check() and stop() to cut the interval wait short
+        self._wake_event = threading.Event()
+        # Completed by stop() so that a sweep waiting on check results
+        # wakes up immediately
+        self._stop_future: Future = Future()
+        # When the device list was last saved (time.monotonic())
+        self._last_saved: float | None = None
 
     @abstractmethod
     def check_device(self, ip_address: str) -> bool:
@@ -129,23 +208,92 @@ class DeviceHeartbeat(ABC):
             (e.g., "interval=60s, timeout=5s" or "method=tcp, port=80")
         """
 
+    def _check_devices(
+        self,
+        pool: ThreadPoolExecutor,
+        ip_addresses: dict[str, str],
+        check: Callable[[str], bool] | None = None,
+    ) -> dict[str, bool]:
+        """
+        Check several devices concurrently.
+
+        Runs check_device for each device on the thread pool. Subclasses
+        may override this with a more efficient batched check.
+
+        Args:
+            pool: Thread pool to run the checks on
+            ip_addresses: Dictionary mapping MAC addresses to IP addresses
+            check: Check to run instead of check_device
+
+        Returns:
+            Dictionary mapping MAC addresses to reachability status;
+            devices whose check failed are omitted
+        """
+        if check is None:
+            check = self.check_device
+        results = {}
+        futures = {
+            pool.submit(check, ip_address): mac_address
+            for mac_address, ip_address in ip_addresses.items()
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(
+                pending | {self._stop_future}, return_when=FIRST_COMPLETED
+            )
+            if self._stop_future in done:
+                for future in pending:
+                    future.cancel()
+                break
+            pending.discard(self._stop_future)
+
+            for future in done:
+                mac_address = futures[future]
+                try:
+                    results[mac_address] = future.result()
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error(
+                        "Error checking %s %s: %s",
+                        self.device_type,
+                        mac_address,
+                        str(e),
+                    )
+        return results
+
     def _update_device_status(
-        self, mac_address: str, is_reachable: bool
-    ) -> None:
+        self,
+        mac_address: str,
+        is_reachable: bool,
+        last_seen: str | None = None,
+        devices: dict | None = None,
+        events: list[tuple[str, dict]] | None = None,
+    ) -> bool:
         """
         Update device status and last_seen timestamp.
 
+        The change is not persisted; callers save the device list once
+        after updating all devices.
+
         Args:
             mac_address: MAC address of the device
             is_reachable: Whether the device is currently reachable
-        """
-        devices = self._get_devices_dict()
-        if mac_address not in devices:
-            return
+            last_seen: Timestamp to record if the device is reachable
+                (default: now)
+            devices: Devices dictionary of the current sweep
+                (default: _get_devices_dict())
+            events: List collecting the status change event for later
+                delivery (default: notify the callback right away)
 
-        device = devices[mac_address]
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        Returns:
+            True if the device's status changed
+        """
+        if devices is None:
+            devices = self._get_devices_dict()
+        device = devices.get(mac_address)
+        if device is None:
+            return False
 
+        previous_status = device["status"]
         status_changed = False
 
         if is_reachable:
@@ -153,67 +301,121 @@ class DeviceHeartbeat(ABC):
             if device["status"] != "connected":
                 logger.info(
                     "%s '%s' is now reachable at %s",
-                    self.device_type.capitalize(),
+                    self._device_name,
                     device["hostname"],
                     device["ip_address"],
                 )
                 status_changed = True
-            device["status"] = "connected"
-            device["last_seen"] = timestamp
+                device["status"] = "connected"
+            if last_seen is None:
+                last_seen = _format_last_seen(int(time.time()))
+            device["last_seen"] = last_seen
         else:
             # Device is not reachable - update status to disconnected
             if device["status"] == "connected":
                 logger.warning(
                     "%s '%s' is no longer reachable at %s",
-                    self.device_type.capitalize(),
+                    self._device_name,
                     device["hostname"],
                     device["ip_address"],
                 )
                 status_changed = True
-            device["status"] = "disconnected"
+            if previous_status != "disconnected":
+                device["status"] = "disconnected"
             # Don't update last_seen on failure - keep the last successful time
 
-        # Persist changes to settings
-        self._save_device_list()
-
         # Notify callback if status changed
         if status_changed and self.status_change_callback:
+            event_type = (
+                self._online_event if is_reachable else self._offline_event
+            )
+            if events is None:
+                self._notify_status_changes([(event_type, dict(device))])
+            else:
+                events.append((event_type, dict(device)))
+
+        return device["status"] != previous_status
+
+    def _notify_status_changes(self, events: list[tuple[str, dict]]) -> None:
+        """
+        Pass status change events to the status change callback.
+
+        Args:
+            events: (event_type, device_data) pairs in the order in which
+                the changes happened
+        """
+        if not self.status_change_callback:
+            return
+        for event_type, device_data in events:
             try:
-                event_type = (
-                    f"{self.device_type}_status_changed_online"
-                    if is_reachable
-                    else f"{self.device_type}_status_changed_offline"
-                )
-                self.status_change_callback(event_type, dict(device))
+                self.status_change_callback(event_type, device_data)
             except Exception as e:  # pylint: disable=broad-except
                 logger.error(
                     "Error calling status change callback: %s", str(e)
                 )
 
-    def _check_and_remove_stale_devices(self) -> None:
+    def _save_after_sweep(self, status_changed: bool, refreshed: bool) -> None:
+        """
+        Persist the results of a sweep.
+
+        Status changes are saved right away. Refreshed last_seen timestamps
+        alone are saved at most every LAST_SEEN_SAVE_INTERVAL seconds; this
+        keeps the settings file from being rewritten on every sweep while
+        keeping last_seen recent enough for stale device removal after a
+        restart.
+
+        Args:
+            status_changed: Whether the status of any device changed
+            refreshed: Whether the last_seen of any device was refreshed
+        """
+        now = time.monotonic()
+        if not status_changed:
+            if not refreshed:
+                return
+            if (
+                self._last_saved is not None
+                and now - self._last_saved < LAST_SEEN_SAVE_INTERVAL
+            ):
+                return
+        self._save_device_list()
+        self._last_saved = now
+
+    def _check_and_remove_stale_devices(
+        self, now: datetime | None = None, devices: dict | None = None
+    ) -> None:
         """
         Check for devices not seen within configured timeout.
 
         Remove devices whose last_seen timestamp exceeds the
         configured hours threshold. Called during heartbeat
         monitoring loop if auto-removal is enabled.
+
+        Args:
+            now: Current time (default: now)
+            devices: Devices dictionary of the current sweep
+                (default: _get_devices_dict())
         """
-        now = datetime.now(timezone.utc)
+        # Offline durations are only logged at debug level
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if not self.auto_remove_enabled and not debug_enabled:
+            # Nothing would be removed or logged
+            return
+
+        if now is None:
+            now = datetime.now(timezone.utc)
         removal_threshold = timedelta(hours=self.auto_remove_hours)
 
         devices_to_remove = []
-        devices = self._get_devices_dict()
+        if devices is None:
+            devices = self._get_devices_dict()
 
-        for mac_address, device in list(devices.items()):
+        for mac_address, device in devices.copy().items():
             last_seen_str = device.get("last_seen")
             if not last_seen_str:
                 continue
 
             try:
-                # Parse ISO8601 timestamp
-                last_seen = datetime.fromisoformat(
-                    last_seen_str.replace("Z", "+00:00")
-                )
+                last_seen = _parse_last_seen(last_seen_str)
 
                 # Calculate time since last seen
                 time_since_seen = now - last_seen
@@ -223,15 +425,14 @@ class DeviceHeartbeat(ABC):
                 if time_since_seen > removal_threshold:
                     devices_to_remove.append((mac_address, device))
                     logger.info(
-                        "%s '%s' (%s) not seen for %.1f hours, "
-                        + "scheduling for auto-removal",
-                        self.device_type.capitalize(),
+                        _STALE_REMOVAL_FMT,
+                        self._device_name,
                         device["hostname"],
                         mac_address,
                         hours_offline,
                     )
                 # Log status for offline devices (debugging)
-                elif device["status"] == "disconnected":
+                elif debug_enabled and device["status"] == "disconnected":
                     if self.auto_remove_enabled:
                         # Calculate time until removal
                         time_until_removal = (
@@ -242,10 +443,8 @@ class DeviceHeartbeat(ABC):
                         )
 
                         logger.debug(
-                            "%s '%s' (%s) at %s has been offline "
-                            + "for %.1f hours, will be auto-removed "
-                            + "in %.1f hours",
-                            self.device_type.capitalize(),
+                            _STALE_OFFLINE_FMT,
+                            self._device_name,
                             device["hostname"],
                             mac_address,
                             device["ip_address"],
@@ -255,16 +454,15 @@ class DeviceHeartbeat(ABC):
                     else:
                         # Auto-removal disabled, log offline duration
                         logger.debug(
-                            "%s '%s' (%s) at %s has been offline "
-                            + "for %.1f hours (auto-removal disabled)",
-                            self.device_type.capitalize(),
+                            _STALE_OFFLINE_KEPT_FMT,
+                            self._device_name,
                             device["hostname"],
                             mac_address,
                             device["ip_address"],
                             hours_offline,
                         )
 
-            except (ValueError, AttributeError) as e:
+            except (ValueError, AttributeError, TypeError) as e:
                 logger.warning(
                     "Could not parse last_seen timestamp for %s %s: %s",
                     self.device_type,
@@ -275,13 +473,12 @@ class DeviceHeartbeat(ABC):
         # Remove devices outside iteration loop
         # (only if auto-removal is enabled)
         if self.auto_remove_enabled:
+            removed = False
             for mac_address, device in devices_to_remove:
                 try:
                     # Remove from in-memory dictionary
                     del devices[mac_address]
-
-                    # Persist changes
-                    self._save_device_list()
+                    removed = True
 
                     logger.info(
                         "Auto-removed %s '%s' (%s) at %s",
@@ -295,7 +492,7 @@ class DeviceHeartbeat(ABC):
                     if self.status_change_callback:
                         try:
                             self.status_change_callback(
-                                f"{self.device_type}_removed", dict(device)
+                                self._removed_event, dict(device)
                             )
                         except Exception as e:  # pylint: disable=broad-except
                             logger.error(
@@ -311,6 +508,10 @@ class DeviceHeartbeat(ABC):
                         mac_address,
                         str(e),
                     )
+
+            # Persist all removals at once
+            if removed:
+                self._save_device_list()
         elif devices_to_remove:
             # Auto-removal disabled but devices would have been removed
             logger.debug(
@@ -319,6 +520,20 @@ class DeviceHeartbeat(ABC):
                 self.device_type,
             )
 
+    def _wait_for_next_sweep(self) -> None:
+        """Wait for the check interval unless woken up earlier."""
+        self._wake_event.wait(self.interval)
+        self._wake_event.clear()
+
+    def trigger_check(self) -> None:
+        """
+        Start the next sweep without waiting for the check interval.
+
+        Used when devices are added so that their status is confirmed
+        right away.
+        """
+        self._wake_event.set()
+
     def _monitor_loop(self) -> None:
         """Main monitoring loop that runs in a background thread."""
         auto_remove_msg = ""
@@ -327,101 +542,141 @@ class DeviceHeartbeat(ABC):
 
         logger.info(
             "%s heartbeat monitor started (%s%s)",
-            self.device_type.capitalize(),
+            self._device_name,
             self._get_log_context(),
             auto_remove_msg,
         )
 
-        devices = self._get_devices_dict()
+        update_status = self._update_device_status
+        stopped = self._stop_event.is_set
 
-        while not self._stop_event.is_set():
-            try:
-                # Check each device
-                for mac_address, device in list(devices.items()):
-                    if self._stop_event.is_set():
-                        break
+        # Checks run concurrently so that a sweep takes about as long as
+        # the slowest device instead of the sum of all timeouts. Status
+        # updates stay on this thread.
+        pool = ThreadPoolExecutor(
+            max_workers=MAX_CHECK_WORKERS,
+            thread_name_prefix=f"{self._device_name}Check",
+        )
+        try:
+            while not stopped():
+                devices = self._get_devices_dict()
+                if not devices:
+                    # Nothing to check or remove until devices are added
+                    self._wait_for_next_sweep()
+                    continue
+                try:
+                    ip_addresses = {}
+                    for mac_address, device in devices.copy().items():
+                        ip_address = device["ip_address"]
+                        if not ip_address:
+                            continue
 
-                    ip_address = device["ip_address"]
-                    if not ip_address:
-                        continue
+                        logger.debug(
+                            "Checking %s '%s' at %s",
+                            self.device_type,
+                            device["hostname"],
+                            ip_address,
+                        )
+                        ip_addresses[mac_address] = ip_address
 
-                    logger.debug(
-                        "Checking %s '%s' at %s",
-                        self.device_type,
-                        device["hostname"],
-                        ip_address,
+                    results = self._check_devices(pool, ip_addresses)
+                    if stopped():
+                        break
+                    # All devices of a sweep share one timestamp
+                    sweep_time = time.time()
+                    last_seen = _format_last_seen(int(sweep_time))
+                    status_changed = False
+                    events: list[tuple[str, dict]] = []
+                    for mac_address, is_reachable in results.items():
+                        if update_status(
+                            mac_address,
+                            is_reachable,
+                            last_seen,
+                            devices,
+                            events,
+                        ):
+                            status_changed = True
+
+                    # Persist all changes of this sweep at once, then
+                    # tell clients about them
+                    self._save_after_sweep(
+                        status_changed, any(results.values())
                     )
+                    self._notify_status_changes(events)
 
-                    is_reachable = self.check_device(ip_address)
-                    self._update_device_status(mac_address, is_reachable)
-
-                # Check for stale devices after status checks
-                self._check_and_remove_stale_devices()
+                    # Check for stale devices after status checks
+                    self._check_and_remove_stale_devices(
+                        datetime.fromtimestamp(sweep_time, timezone.utc),
+                        devices=devices,
+                    )
 
-            except Exception as e:  # pylint: disable=broad-except
-                logger.error(
-                    "Error in %s heartbeat monitor loop: %s",
-                    self.device_type,
-                    str(e),
-                )
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error(
+                        "Error in %s heartbeat monitor loop: %s",
+                        self.device_type,
+                        str(e),
+                    )
 
-            # Wait for the next check interval or stop event
-            self._stop_event.wait(self.interval)
+                # Wait for the next check interval, trigger or stop event
+                self._wait_for_next_sweep()
+        finally:
+            # Don't hold up stop() on checks that are still in flight
+            pool.shutdown(wait=False, cancel_futures=True)
 
-        logger.info(
-            "%s heartbeat monitor stopped", self.device_type.capitalize()
-        )
+        logger.info("%s heartbeat monitor stopped", self._device_name)
 
     def start(self) -> None:
         """Start the heartbeat monitoring thread."""
         if not self.enabled:
             logger.info(
                 "%s heartbeat monitoring is disabled",
-                self.device_type.capitalize(),
+                self._device_name,
             )
             return
 
         if self._running:
             logger.warning(
                 "%s heartbeat monitor is already running",
-                self.device_type.capitalize(),
+                self._device_name,
             )
             return
 
         self._running = True
         self._stop_event.clear()
-        thread_name = f"{self.device_type.capitalize()}Heartbeat"
+        self._wake_event.clear()
+        self._stop_future = Future()
+        thread_name = f"{self._device_name}Heartbeat"
         self._thread = threading.Thread(
             target=self._monitor_loop, daemon=True, name=thread_name
         )
         self._thread.start()
-        logger.info(
-            "%s heartbeat monitoring started", self.device_type.capitalize()
-        )
+        logger.info("%s heartbeat monitoring started", self._device_name)
 
     def stop(self) -> None:
         """Stop the heartbeat monitoring thread."""
         if not self._running:
             logger.warning(
                 "%s heartbeat monitor is not running",
-                self.device_type.capitalize(),
+                self._device_name,
             )
             return
 
         self._running = False
         self._stop_event.set()
+        self._wake_event.set()
+        self._stop_future.set_result(None)
 
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5)
             if self._thread.is_alive():
                 logger.warning(
                     "%s heartbeat monitor thread did not stop cleanly",
-                    self.device_type.capitalize(),
+                    self._device_name,
                 )
             else:
                 logger.info(
                     "%s heartbeat monitoring stopped",
-                    self.device_type.capitalize(),
+                    self._device_name,
                 )
 
     def check_now(self) -> dict[str, bool]:
@@ -429,22 +684,38 @@ class DeviceHeartbeat(ABC):
         Immediately check all devices and return results.
 
         This can be called manually to force a check outside the
-        regular interval.
+        regular interval. Devices are checked concurrently.
 
         Returns:
             Dictionary mapping MAC addresses to reachability status
         """
-        results = {}
         devices = self._get_devices_dict()
+        results = {}
+        ip_addresses = {}
+        for mac_address, device in devices.copy().items():
+            results[mac_address] = False
+            if device["ip_address"]:
+                ip_addresses[mac_address] = device["ip_address"]
 
-        for mac_address, device in devices.items():
-            ip_address = device["ip_address"]
-            if not ip_address:
-                results[mac_address] = False
-                continue
-
-            is_reachable = self.check_device(ip_address)
-            self._update_device_status(mac_address, is_reachable)
-            results[mac_address] = is_reachable
+        status_changed = False
+        events: list[tuple[str, dict]] = []
+        if ip_addresses:
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_CHECK_WORKERS, len(ip_addresses)),
+                thread_name_prefix=f"{self._device_name}Check",
+            ) as pool:
+                reachable = list(
+                    pool.map(self.check_device, ip_addresses.values())
+                )
+            last_seen = _format_last_seen(int(time.time()))
+            for mac_address, is_reachable in zip(ip_addresses, reachable):
+                if self._update_device_status(
+                    mac_address, is_reachable, last_seen, devices, events
+                ):
+                    status_changed = True
+                results[mac_address] = is_reachable
+
+        self._save_after_sweep(status_changed, any(results.values()))
+        self._notify_status_changes(events)
 
         return results
@@ -31,6 +31,10 @@ with open(_settings_file, encoding="utf-8") as fd_registry:
         yaml.load(fd_registry, Loader=yaml.SafeLoader)
     )
 
+# Model files whose checksum was verified, mapped to the (inode, size,
+# mtime) they had at the time, so that unchanged files are not hashed again
+_VERIFIED_MODELS: dict[Path, tuple[int, int, int]] = {}
+
 
 def create_registry(models_dir: Path):
     """
@@ -79,15 +83,19 @@ def verify_file_checksum(file_path: Path, expected_sha256: str) -> bool:
     """
     Verify file checksum.
     """
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(chunk)
-
-    computed_hash = sha256_hash.hexdigest()
+        computed_hash = hashlib.file_digest(f, "sha256").hexdigest()
     return computed_hash == expected_sha256
 
 
+def _file_signature(file_path: Path) -> tuple[int, int, int]:
+    """
+    Get the inode, size and modification time of a file.
+    """
+    stat = file_path.stat()
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
 def download_file(
     url: str,
     destination: Path,
@@ -307,6 +315,9 @@ def ensure_model_available(
 
     # Check if model already exists and is valid
     if model_path.exists():
+        signature = _file_signature(model_path)
+        if _VERIFIED_MODELS.get(model_path) == signature:
+            return model_path
         model_info = MODEL_REGISTRY[model_name]
         sha256 = model_info.get("sha256")
         if isinstance(sha256, str) and verify_file_checksum(
@@ -315,6 +326,7 @@ def ensure_model_available(
             logger.debug(
                 "Model %s already available at %s", model_name, model_path
             )
+            _VERIFIED_MODELS[model_path] = signature
             return model_path
         if not isinstance(sha256, str):
             raise RuntimeError("Could not get sha256")
@@ -21,6 +21,9 @@ import requests
 from pumaguard.device_heartbeat import (
     DeviceHeartbeat,
 )
+from pumaguard.shelly_control import (
+    get_shelly_session,
+)
 
 if TYPE_CHECKING:
     from pumaguard.web_ui import (
@@ -29,6 +32,13 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Device information endpoint used for liveness checks. Its response is
+# much smaller than the full Switch.GetStatus document.
+LIVENESS_PATH = "/shelly"
+
+# Bytes of the liveness response inspected by a check
+HTTP_READ_SIZE = 4096
+
 
 class PlugHeartbeat(DeviceHeartbeat):
     """
@@ -76,13 +86,43 @@ class PlugHeartbeat(DeviceHeartbeat):
             auto_remove_hours=auto_remove_hours,
         )
         self.timeout = timeout
+        # Reuse keep-alive connections to the plugs across checks
+        self._session = get_shelly_session()
+        # Prepared liveness requests by plug IP address
+        self._liveness_requests: dict[str, requests.PreparedRequest] = {}
+
+        # Plug list as last written to the settings file
+        self._saved_plug_list: list[dict] | None = None
+
+    def _get_liveness_request(
+        self, ip_address: str
+    ) -> requests.PreparedRequest:
+        """
+        Get the prepared liveness request for a plug.
+
+        The request is built once per IP address so that polls skip URL
+        parsing and header assembly.
+
+        Args:
+            ip_address: IP address of the plug
+
+        Returns:
+            Prepared GET request for the plug's liveness endpoint
+        """
+        request = self._liveness_requests.get(ip_address)
+        if request is None:
+            request = self._session.prepare_request(
+                requests.Request("GET", f"http://{ip_address}{LIVENESS_PATH}")
+            )
+            self._liveness_requests[ip_address] = request
+        return request
 
     def _check_http(self, ip_address: str) -> bool:
         """
         Check plug availability using HTTP REST API request.
 
-        Queries the Shelly Gen2 Switch.GetStatus endpoint to verify
-        the plug is responsive.
+        Queries the small Shelly device information endpoint to verify
+        the plug is responsive. The switch state is not needed here.
 
         Args:
             ip_address: IP address of the plug
@@ -91,17 +131,20 @@ class PlugHeartbeat(DeviceHeartbeat):
             True if HTTP request successful, False otherwise
         """
         try:
-            url = f"http://{ip_address}/rpc/Switch.GetStatus?id=0"
-            response = requests.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            # Verify response contains expected data
-            data = response.json()
-            return "output" in data
-        except (
-            requests.exceptions.RequestException,
-            ValueError,
-            KeyError,
-        ) as e:
+            response = self._session.send(
+                self._get_liveness_request(ip_address),
+                timeout=self.timeout,
+                stream=True,
+            )
+            try:
+                response.raise_for_status()
+                # Verify the device identifies itself without decoding
+                # the JSON document
+                chunk = next(response.iter_content(HTTP_READ_SIZE), b"")
+                return b'"mac"' in chunk
+            finally:
+                response.close()
+        except requests.exceptions.RequestException as e:
             logger.debug("HTTP check failed for %s: %s", ip_address, str(e))
             return False
 
@@ -144,20 +187,22 @@ class PlugHeartbeat(DeviceHeartbeat):
     def _save_device_list(self) -> None:
         """Save the plug list to settings file."""
         try:
-            plug_list = []
-            for _, plug_info in self.webui.plugs.items():
-                plug_list.append(
-                    {
-                        "hostname": plug_info["hostname"],
-                        "ip_address": plug_info["ip_address"],
-                        "mac_address": plug_info["mac_address"],
-                        "last_seen": plug_info["last_seen"],
-                        "status": plug_info["status"],
-                        "mode": plug_info.get("mode", "automatic"),
-                    }
-                )
+            plug_list = [
+                {
+                    "hostname": plug_info["hostname"],
+                    "ip_address": plug_info["ip_address"],
+                    "mac_address": plug_info["mac_address"],
+                    "last_seen": plug_info["last_seen"],
+                    "status": plug_info["status"],
+                    "mode": plug_info.get("mode", "automatic"),
+                }
+                for plug_info in self.webui.plugs.values()
+            ]
             self.webui.presets.plugs = plug_list
+            if plug_list == self._saved_plug_list:
+                return
             self.webui.presets.save()
+            self._saved_plug_list = [dict(plug) for plug in plug_list]
         except Exception as e:  # pylint: disable=broad-except
             logger.error("Failed to save plug list: %s", str(e))
 
@@ -176,7 +221,7 @@ class PlugHeartbeat(DeviceHeartbeat):
     # Backwards compatibility methods for tests
     def _update_plug_status(
         self, mac_address: str, is_reachable: bool
-    ) -> None:
+    ) -> bool:
         """
         Update plug status and last_seen timestamp.
 
@@ -186,6 +231,9 @@ class PlugHeartbeat(DeviceHeartbeat):
         Args:
             mac_address: MAC address of the plug
             is_reachable: Whether the plug is currently reachable
+
+        Returns:
+            True if the plug's status changed
         """
         return self._update_device_status(mac_address, is_reachable)
 
@@ -2,10 +2,15 @@
 The presets for each model.
 """
 
+# pylint: disable=too-many-lines
+
 import copy
 import logging
 import os
 import shutil
+import stat
+import tempfile
+import threading
 from pathlib import (
     Path,
 )
@@ -15,8 +20,75 @@ from typing import (
 
 import yaml
 
+try:
+    # Use the libyaml bindings when PyYAML was built with them
+    from yaml import CDumper as YamlDumper
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # pragma: no cover (PyYAML without libyaml)
+    from yaml import Dumper as YamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as YamlSafeLoader  # type: ignore[assignment]
+
 logger = logging.getLogger("PumaGuard")
 
+# Paths relative to the package, resolved once at import
+_DEFAULT_MODELS_DIR = os.path.join(
+    os.path.dirname(__file__), "../pumaguard-models"
+)
+_BUNDLED_SOUND_DIRS = (
+    Path(__file__).resolve().parent.parent / "pumaguard-sounds",
+    Path(__file__).resolve().parent / "pumaguard-sounds",
+)
+
+# Directory list settings: (settings file key, attribute, default)
+_DIRECTORY_SETTINGS = (
+    ("lion-directories", "lion_directories", ["undefined"]),
+    ("no-lion-directories", "no_lion_directories", ["undefined"]),
+    ("validation-lion-directories", "validation_lion_directories", []),
+    (
+        "validation-no-lion-directories",
+        "validation_no_lion_directories",
+        [],
+    ),
+)
+
+# Serializes saves from the heartbeat threads and the web routes
+_SAVE_LOCK = threading.Lock()
+
+# Permissions of a settings file that did not exist before
+_NEW_SETTINGS_FILE_MODE = 0o644
+
+# Parsed settings files by path, with the (inode, size, mtime) of the file
+# they were parsed from
+_PARSED_SETTINGS: dict[str, tuple[tuple[int, int, int], dict]] = {}
+
+
+def _read_settings_file(filename: str) -> dict:
+    """
+    Parse a YAML settings file.
+
+    The parsed settings are reused until the file changes. Every caller
+    gets its own copy.
+    """
+    try:
+        file_stat = os.stat(filename)
+        signature = (
+            file_stat.st_ino,
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+        )
+    except OSError:
+        signature = None
+    cached = _PARSED_SETTINGS.get(filename)
+    if signature is not None and cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+    # Parse from memory; the YAML parser decodes UTF-8 itself
+    with open(filename, "rb") as fd:
+        data = fd.read()
+    settings = yaml.load(data, Loader=YamlSafeLoader)
+    if signature is not None:
+        _PARSED_SETTINGS[filename] = (signature, copy.deepcopy(settings))
+    return settings
+
 
 def get_xdg_config_home() -> Path:
     """
@@ -122,11 +194,7 @@ def get_default_sound_path() -> str:
     # Copy bundled default sound files if present and not already in
     # sound_dir. This covers both the installed package layout
     # (pumaguard/../pumaguard-sounds) and a source checkout.
-    package_sound_dirs = [
-        Path(__file__).resolve().parent.parent / "pumaguard-sounds",
-        Path(__file__).resolve().parent / "pumaguard-sounds",
-    ]
-    for pkg_dir in package_sound_dirs:
+    for pkg_dir in _BUNDLED_SOUND_DIRS:
         if pkg_dir.exists() and pkg_dir.is_dir():
             for item in pkg_dir.iterdir():
                 if item.is_file() and not (sound_dir / item.name).exists():
@@ -166,9 +234,7 @@ class Settings:
         self.yolo_model_filename = "yolov8s_101425.pt"
         self.classifier_model_filename = "colorbw_111325.h5"
         self.puma_threshold = 0.5
-        self.base_output_directory = os.path.join(
-            os.path.dirname(__file__), "../pumaguard-models"
-        )
+        self.base_output_directory = _DEFAULT_MODELS_DIR
         self.sound_path = get_default_sound_path()
         self.deterrent_sound_files = ["deterrent_puma.mp3"]
         self.verification_path = "data/stable/stable_test"
@@ -260,8 +326,7 @@ class Settings:
         # Update settings_file to the file we're loading from
         self.settings_file = filename
         try:
-            with open(filename, encoding="utf-8") as fd:
-                settings = yaml.safe_load(fd)
+            settings = _read_settings_file(filename)
         except FileNotFoundError:
             logger.error(
                 "Could not open settings (%s), using defaults", filename
@@ -335,38 +400,13 @@ class Settings:
         self.verification_path = settings.get(
             "verification-path", "data/stable/stable_test"
         )
-        lions = settings.get("lion-directories", ["undefined"])
-        if not isinstance(lions, list) or not all(
-            isinstance(p, str) for p in lions
-        ):
-            raise ValueError("expected lion-directories to be a list of paths")
-        self.lion_directories = lions
-        no_lions = settings.get("no-lion-directories", ["undefined"])
-        if not isinstance(no_lions, list) or not all(
-            isinstance(p, str) for p in no_lions
-        ):
-            raise ValueError(
-                "expected no-lion-directories to be a list of paths"
-            )
-        self.no_lion_directories = no_lions
-        validation_lions = settings.get("validation-lion-directories", [])
-        if not isinstance(validation_lions, list) or not all(
-            isinstance(p, str) for p in validation_lions
-        ):
-            raise ValueError(
-                "expected validation-lion-directories to be a list of paths"
-            )
-        self.validation_lion_directories = validation_lions
-        validation_no_lions = settings.get(
-            "validation-no-lion-directories", []
-        )
-        if not isinstance(validation_no_lions, list) or not all(
-            isinstance(p, str) for p in validation_no_lions
-        ):
-            raise ValueError(
-                "expected validation-no-lion-directories to be a list of paths"
-            )
-        self.validation_no_lion_directories = validation_no_lions
+        for key, attribute, default in _DIRECTORY_SETTINGS:
+            directories = settings.get(key, default)
+            if not isinstance(directories, list) or not all(
+                isinstance(p, str) for p in directories
+            ):
+                raise ValueError(f"expected {key} to be a list of paths")
+            setattr(self, attribute, directories)
         self.with_augmentation = settings.get("with-augmentation", False)
         self.file_stabilization_extra_wait = settings.get(
             "file-stabilization-extra-wait", 1
@@ -424,10 +464,37 @@ class Settings:
     def save(self):
         """
         Write presets to settings file.
-        """
-        settings_dict = dict(self)
-        with open(self.settings_file, "w", encoding="utf-8") as f:
-            yaml.dump(settings_dict, f, default_flow_style=False)
+
+        The settings are written to a temporary file first which then
+        replaces the settings file, so that an interrupted save does not
+        leave a truncated settings file behind. The settings file keeps
+        its permissions.
+        """
+        settings_dict = self._as_dict()
+        settings_file = os.path.realpath(self.settings_file)
+        with _SAVE_LOCK:
+            fd, temporary_file = tempfile.mkstemp(
+                dir=os.path.dirname(settings_file),
+                prefix=f".{os.path.basename(settings_file)}.",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    yaml.dump(
+                        settings_dict,
+                        f,
+                        Dumper=YamlDumper,
+                        default_flow_style=False,
+                    )
+                try:
+                    mode = stat.S_IMODE(os.stat(settings_file).st_mode)
+                except FileNotFoundError:
+                    mode = _NEW_SETTINGS_FILE_MODE
+                os.chmod(temporary_file, mode)
+                os.replace(temporary_file, settings_file)
+            except BaseException:
+                os.unlink(temporary_file)
+                raise
         logger.info("Settings saved to %s", self.settings_file)
 
     def _relative_paths(self, base: str, paths: list[str]) -> list[str]:
@@ -436,12 +503,12 @@ class Settings:
         """
         return [os.path.relpath(path, start=base) for path in paths]
 
-    def __iter__(self):
+    def _as_dict(self) -> dict:
         """
-        Serialize this class.
+        The settings as they are written to the settings file.
         """
         # pylint: disable=line-too-long
-        yield from {
+        return {
             "YOLO-min-size": self.yolo_min_size,
             "YOLO-conf-thresh": self.yolo_conf_thresh,
             "YOLO-max-dets": self.yolo_max_dets,
@@ -479,13 +546,19 @@ class Settings:
             "plug-heartbeat-enabled": self.plug_heartbeat_enabled,
             "plug-heartbeat-interval": self.plug_heartbeat_interval,
             "plug-heartbeat-timeout": self.plug_heartbeat_timeout,
-        }.items()
+        }
+
+    def __iter__(self):
+        """
+        Serialize this class.
+        """
+        yield from self._as_dict().items()
 
     def __str__(self):
         """
         Serialize this class.
         """
-        return yaml.dump(dict(self), indent=2)
+        return yaml.dump(self._as_dict(), Dumper=YamlDumper, indent=2)
 
     @property
     def yolo_min_size(self) -> float:
@@ -801,7 +874,7 @@ class Settings:
             raise TypeError("image dimensions needs to be a tuple")
         if not all(x > 0 for x in dimensions):
             raise ValueError("image dimensions need to be positive")
-        self._image_dimensions = copy.deepcopy(dimensions)
+        self._image_dimensions = dimensions
 
     @property
     def epochs(self) -> int:
@@ -833,7 +906,7 @@ class Settings:
         """
         Set the lion directories.
         """
-        self._lion_directories = copy.deepcopy(lions)
+        self._lion_directories = list(lions)
 
     @property
     def validation_lion_directories(self) -> list[str]:
@@ -847,7 +920,7 @@ class Settings:
         """
         Set the lion directories for validation.
         """
-        self._validation_lion_directories = copy.deepcopy(lions)
+        self._validation_lion_directories = list(lions)
 
     @property
     def no_lion_directories(self) -> list[str]:
@@ -861,7 +934,7 @@ class Settings:
         """
         Set the no_lion directories.
         """
-        self._no_lion_directories = copy.deepcopy(no_lions)
+        self._no_lion_directories = list(no_lions)
 
     @property
     def validation_no_lion_directories(self) -> list[str]:
@@ -875,7 +948,7 @@ class Settings:
         """
         Set the no_lion directories for validation.
         """
-        self._validation_no_lion_directories = copy.deepcopy(no_lions)
+        self._validation_no_lion_directories = list(no_lions)
 
     @property
     def model_function_name(self) -> str:
@@ -14,6 +14,9 @@ import subprocess
 import sys
 import threading
 import time
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
 from pathlib import (
     Path,
 )
@@ -52,6 +55,33 @@ from pumaguard.web_ui import (
 
 logger = logging.getLogger("PumaGuard")
 
+# Upper bound on files handled concurrently per watched folder;
+# classification itself is serialized by the classification lock
+MAX_HANDLER_WORKERS = 2
+
+# Upper bound on plugs switched concurrently around a deterrent sound
+MAX_PLUG_WORKERS = 8
+
+# Longest delay between restarts of a failing observer, in seconds
+MAX_RESTART_DELAY = 60
+
+# A folder modified this recently may get another file without its mtime
+# changing (FAT/exFAT stores 2 s steps, SMB and 9p mounts about 1 s), so
+# the "os" method keeps listing it, in nanoseconds
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+# The "os" method lists the folder at least this often, in polls, in case
+# the folder's clock is skewed against ours
+FULL_LISTING_POLLS = 60
+
+# (detector, classifier) model filenames already cached by this process
+_CACHED_MODELS: set[tuple[str, str]] = set()
+
+JPEG_EXTENSIONS = (".jpg", ".jpeg")
+
+# Every complete JPEG file ends with the End Of Image marker
+JPEG_END_MARKER = b"\xff\xd9"
+
 
 def configure_subparser(parser: argparse.ArgumentParser):
     """
@@ -95,6 +125,48 @@ def configure_subparser(parser: argparse.ArgumentParser):
     )
 
 
+def _has_jpeg_end_marker(filepath: str) -> bool:
+    """
+    Check whether a JPEG file ends with the End Of Image marker.
+
+    Arguments:
+        filepath -- The path of the file to check.
+    """
+    if not filepath.lower().endswith(JPEG_EXTENSIONS):
+        return False
+    with open(filepath, "rb") as f:
+        f.seek(-len(JPEG_END_MARKER), os.SEEK_END)
+        return f.read() == JPEG_END_MARKER
+
+
+def cache_models(presets: Settings, warm: bool = False):
+    """
+    Cache the model weights once per process.
+
+    Arguments:
+        presets -- The settings naming the models.
+        warm -- Also load the models into memory, even if their weights are
+            already cached.
+    """
+    models = (presets.yolo_model_filename, presets.classifier_model_filename)
+    if models in _CACHED_MODELS and not warm:
+        logger.debug("Models are already cached")
+        return
+    lock = acquire_lock()
+    try:
+        logger.debug("Caching models")
+        cache_model_two_stage(
+            yolo_model_filename=presets.yolo_model_filename,
+            classifier_model_filename=presets.classifier_model_filename,
+            print_progress=presets.print_download_progress,
+            warm=warm,
+        )
+    finally:
+        lock.release()
+    _CACHED_MODELS.add(models)
+    logger.debug("Models are cached")
+
+
 class FolderObserver:
     """
     FolderObserver watches a folder for new files.
@@ -109,60 +181,68 @@ class FolderObserver:
         self.webui: WebUI = webui
         self._stop_event: threading.Event = threading.Event()
         self._thread: threading.Thread | None = None
-        self._monitor_thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor = self._create_executor()
 
     def start(self):
         """
-        Start watching the folder, with monitoring and auto-restart.
+        Start watching the folder, restarting the observer if it fails.
         """
         self._stop_event.clear()
-        if self._monitor_thread and self._monitor_thread.is_alive():
+        if self._thread and self._thread.is_alive():
             logger.warning(
-                "Monitor thread already running for %s", self.folder
+                "Observer thread already running for %s", self.folder
             )
             return
-        self._monitor_thread = threading.Thread(
-            target=self._monitor_observer, name=f"Monitor-{self.folder}"
+        self._executor = self._create_executor()
+        self._thread = threading.Thread(
+            target=self._observe_forever, name=f"Observer-{self.folder}"
         )
-        self._monitor_thread.daemon = True
-        self._monitor_thread.start()
+        self._thread.daemon = True
+        self._thread.start()
 
-    def _monitor_observer(self):
+    def _observe_forever(self):
         """
-        Monitor the observer thread, restart if it crashes.
+        Run the observer until stopped, restarting it with an exponential
+        backoff whenever it crashes or exits.
         """
+        delay = 1
         while not self._stop_event.is_set():
-            self._thread = threading.Thread(
-                target=self._observe, name=f"Observer-{self.folder}"
-            )
-            self._thread.daemon = True
+            started = time.monotonic()
             try:
-                self._thread.start()
-                self._thread.join()
-            except (RuntimeError, threading.ThreadError, TypeError) as exc:
-                logger.warning(
-                    "FolderObserver thread crashed for %s: %s",
-                    self.folder,
-                    exc,
-                )
+                self._observe()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("FolderObserver crashed for %s", self.folder)
             if self._stop_event.is_set():
                 break
+            if time.monotonic() - started > MAX_RESTART_DELAY:
+                # The observer ran fine for a while, start over
+                delay = 1
             logger.warning(
-                "FolderObserver thread for %s exited unexpectedly. "
-                + "Restarting...",
+                "FolderObserver for %s exited unexpectedly. "
+                + "Restarting in %d seconds...",
                 self.folder,
+                delay,
             )
-            time.sleep(1)
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, MAX_RESTART_DELAY)
 
     def stop(self):
         """
-        Stop watching the folder and monitoring thread.
+        Stop watching the folder.
         """
         self._stop_event.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2)
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=2)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _create_executor(self) -> ThreadPoolExecutor:
+        """
+        Create the pool that handles new files.
+        """
+        return ThreadPoolExecutor(
+            max_workers=MAX_HANDLER_WORKERS,
+            thread_name_prefix=f"Handler-{self.folder}",
+        )
 
     def _get_time(self) -> float:
         """
@@ -180,7 +260,12 @@ class FolderObserver:
         self, filepath: str, timeout: int = 10, interval: float = 0.5
     ) -> bool:
         """
-        Wait until the file is no longer open by any process.
+        Wait until the file is complete and its image header parses.
+
+        A file is complete once its size stops changing, or as soon as a
+        JPEG file ends in its End Of Image marker.
+
+        Only the header is read, the pixel data is not decoded or verified.
 
         Arguments:
             filepath -- The path of the file to check.
@@ -191,23 +276,28 @@ class FolderObserver:
         if timeout < 1:
             raise ValueError("timeout needs to be greater than 0")
         start_time = self._get_time()
+        previous_size = -1
         while self._get_time() - start_time < timeout:
             try:
-                logger.debug("Attempting to open image")
-                with Image.open(filepath) as img:
-                    img.verify()
-                logger.debug("Image is loadable")
-                return True
+                size = os.stat(filepath).st_size
+                # A JPEG that already ends in its End Of Image marker does
+                # not need to wait for a second size sample
+                if size >= len(JPEG_END_MARKER) and (
+                    size == previous_size or _has_jpeg_end_marker(filepath)
+                ):
+                    logger.debug("File is complete, reading header")
+                    with Image.open(filepath) as img:
+                        logger.debug("Image header is readable: %s", img.size)
+                    return True
+                previous_size = size
             except FileNotFoundError as e:
                 logger.error("Could not find file %s: %s", filepath, e)
                 return False
             except OSError as e:
                 logger.debug("Image not completely uploaded: %s", e)
-                self._sleep(interval)
-                continue
             except ModuleNotFoundError as e:
                 logger.debug("Missing module: %s", e)
-                self._sleep(interval)
+            self._sleep(interval)
         logger.warning(
             "File %s is still open after %d seconds", filepath, timeout
         )
@@ -218,22 +308,16 @@ class FolderObserver:
         Observe whether a new file is created in the folder.
         """
         logger.info("Starting new observer, method = %s", self.method)
-        lock = acquire_lock()
-        logger.debug("Caching models")
-        cache_model_two_stage(
-            yolo_model_filename=self.presets.yolo_model_filename,
-            classifier_model_filename=self.presets.classifier_model_filename,
-            print_progress=self.presets.print_download_progress,
-        )
-        lock.release()
-        logger.debug("Models are cached")
+        cache_models(self.presets)
         if self.method == "inotify":
             with subprocess.Popen(
                 [
                     "inotifywait",
                     "--monitor",
                     "--event",
-                    "create",
+                    "close_write",
+                    "--event",
+                    "moved_to",
                     "--format",
                     "%w%f",
                     self.folder,
@@ -253,27 +337,35 @@ class FolderObserver:
                         break
                     filepath = line.strip()
                     logger.info("New file detected: %s", filepath)
-                    if self._wait_for_file_stability(filepath):
-                        if self.presets.file_stabilization_extra_wait > 0:
-                            logger.debug(
-                                "Waiting an extra %.2f seconds",
-                                self.presets.file_stabilization_extra_wait,
-                            )
-                            time.sleep(
-                                self.presets.file_stabilization_extra_wait
-                            )
-                        threading.Thread(
-                            target=self._handle_new_file,
-                            args=(filepath,),
-                        ).start()
-                    else:
-                        logger.warning(
-                            "File %s not closed, ignoring", filepath
+                    # The writer has closed the file or it was moved in
+                    # complete, so there is no need to wait for it to
+                    # become stable
+                    if self.presets.file_stabilization_extra_wait > 0:
+                        logger.debug(
+                            "Waiting an extra %.2f seconds",
+                            self.presets.file_stabilization_extra_wait,
                         )
+                        time.sleep(self.presets.file_stabilization_extra_wait)
+                    self._executor.submit(self._handle_new_file, filepath)
         elif self.method == "os":
+            # Stat before listing so that a file created in between changes
+            # the modification time seen on the next poll
+            known_mtime = os.stat(self.folder).st_mtime_ns
             known_files = set(os.listdir(self.folder))
+            polls = 0
             logger.info("New observer started")
             while not self._stop_event.is_set():
+                time.sleep(1)
+                polls += 1
+                mtime = os.stat(self.folder).st_mtime_ns
+                if (
+                    mtime == known_mtime
+                    and time.time_ns() - mtime >= MTIME_GRANULARITY_NS
+                    and polls < FULL_LISTING_POLLS
+                ):
+                    continue
+                known_mtime = mtime
+                polls = 0
                 current_files = set(os.listdir(self.folder))
                 new_files = current_files - known_files
                 for new_file in new_files:
@@ -288,16 +380,12 @@ class FolderObserver:
                             time.sleep(
                                 self.presets.file_stabilization_extra_wait
                             )
-                        threading.Thread(
-                            target=self._handle_new_file,
-                            args=(filepath,),
-                        ).start()
+                        self._executor.submit(self._handle_new_file, filepath)
                     else:
                         logger.warning(
                             "File %s not closed, ignoring", filepath
                         )
                 known_files = current_files
-                time.sleep(1)
         else:
             raise ValueError("FIXME: This method is not implemented")
 
@@ -305,10 +393,40 @@ class FolderObserver:
         """
         Handle the new file detected in the folder.
 
+        The classification lock is released before the image is filed
+        away, so the next file can be classified meanwhile.
+
         Arguments:
             filepath -- The path of the new file.
         """
         me = threading.current_thread()
+        try:
+            is_puma = self._classify_new_file(filepath)
+            self._file_classified_image(filepath, is_puma)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(
+                "Unexpected error while handling %s: %s",
+                filepath,
+                exc,
+                exc_info=True,
+            )
+        finally:
+            logger.debug("Exiting (%s)", me.name)
+
+    def _classify_new_file(self, filepath: str) -> bool:
+        """
+        Classify the new file and deter the puma if there is one.
+
+        The sound and plugs stay under the classification lock so that
+        deterrents of consecutive detections do not overlap.
+
+        Arguments:
+            filepath -- The path of the new file.
+
+        Returns:
+            Whether the file shows a puma.
+        """
+        me = threading.current_thread()
         logger.debug("Acquiring classification lock (%s)", me.name)
         lock = acquire_lock()
         try:
@@ -343,7 +461,8 @@ class FolderObserver:
                     )
                 elif self.presets.play_sound:
                     # Turn on automatic plugs before playing sound
-                    self._turn_on_automatic_plugs()
+                    automatic_plugs = self._get_automatic_plugs()
+                    self._set_automatic_plugs(automatic_plugs, True)
 
                     # Randomly select one sound from the list
                     sound_file = random.choice(
@@ -356,109 +475,122 @@ class FolderObserver:
                     playsound(sound_file_path, self.presets.volume)
 
                     # Turn off automatic plugs after sound finishes
-                    self._turn_off_automatic_plugs()
-            # Move original file into classification folder
-            try:
-                dest_root = (
-                    self.presets.classified_puma_dir
-                    if is_puma
-                    else self.presets.classified_other_dir
-                )
-                Path(dest_root).mkdir(parents=True, exist_ok=True)
-                dest_path = Path(dest_root) / Path(filepath).name
-                shutil.move(filepath, dest_path)
-                logger.info(
-                    "Moved %s to classification folder %s", filepath, dest_path
-                )
-                # Pre-generate thumbnails at both sizes used by the image
-                # browser so the first browser request is served from cache.
-                for size in (200, 400):
-                    generate_thumbnail(str(dest_path), size, size)
-                # Notify SSE clients that a new image is available
-                if self.webui.image_notification_callback is not None:
-                    self.webui.image_notification_callback(
-                        "image_added",
-                        {
-                            "path": str(dest_path),
-                            "folder": dest_root,
-                        },
-                    )
-            except Exception as exc:  # pylint: disable=broad-except
-                logger.error(
-                    "Failed to move %s into classification folder: %s",
-                    filepath,
-                    exc,
-                )
-            # Move viz bounding-box image into the appropriate split folder
-            viz_filename = Path(filepath).stem + "_viz.jpg"
-            viz_src = Path(self.presets.intermediate_dir) / viz_filename
-            if viz_src.exists():
-                viz_dest_root = (
-                    self.presets.intermediate_puma_dir
-                    if is_puma
-                    else self.presets.intermediate_other_dir
-                )
-                try:
-                    Path(viz_dest_root).mkdir(parents=True, exist_ok=True)
-                    viz_dest = Path(viz_dest_root) / viz_filename
-                    shutil.move(str(viz_src), viz_dest)
-                    logger.info("Moved viz image %s to %s", viz_src, viz_dest)
-                except Exception as exc:  # pylint: disable=broad-except
-                    logger.error(
-                        "Failed to move viz image %s: %s", viz_src, exc
-                    )
-            else:
-                logger.debug(
-                    "No viz image found at %s, skipping move", viz_src
+                    self._set_automatic_plugs(automatic_plugs, False)
+            return is_puma
+        finally:
+            lock.release()
+            logger.debug("Released classification lock (%s)", me.name)
+
+    def _file_classified_image(self, filepath: str, is_puma: bool):
+        """
+        Move a classified image and its visualization into their folders.
+
+        Arguments:
+            filepath -- The path of the classified image.
+            is_puma -- Whether the image shows a puma.
+        """
+        # Move original file into classification folder
+        try:
+            dest_root = (
+                self.presets.classified_puma_dir
+                if is_puma
+                else self.presets.classified_other_dir
+            )
+            dest_path = self._move_into(filepath, dest_root)
+            logger.info(
+                "Moved %s to classification folder %s", filepath, dest_path
+            )
+            # Pre-generate thumbnails at both sizes used by the image
+            # browser so the first browser request is served from cache.
+            for size in (200, 400):
+                generate_thumbnail(str(dest_path), size, size)
+            # Notify SSE clients that a new image is available
+            if self.webui.image_notification_callback is not None:
+                self.webui.image_notification_callback(
+                    "image_added",
+                    {
+                        "path": str(dest_path),
+                        "folder": dest_root,
+                    },
                 )
         except Exception as exc:  # pylint: disable=broad-except
             logger.error(
-                "Unexpected error while handling %s: %s",
+                "Failed to move %s into classification folder: %s",
                 filepath,
                 exc,
-                exc_info=True,
             )
-        finally:
-            lock.release()
-            logger.debug("Exiting (%s)", me.name)
+        # Move viz bounding-box image into the appropriate split folder
+        viz_filename = Path(filepath).stem + "_viz.jpg"
+        viz_src = Path(self.presets.intermediate_dir) / viz_filename
+        if viz_src.exists():
+            viz_dest_root = (
+                self.presets.intermediate_puma_dir
+                if is_puma
+                else self.presets.intermediate_other_dir
+            )
+            try:
+                viz_dest = self._move_into(str(viz_src), viz_dest_root)
+                logger.info("Moved viz image %s to %s", viz_src, viz_dest)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("Failed to move viz image %s: %s", viz_src, exc)
+        else:
+            logger.debug("No viz image found at %s, skipping move", viz_src)
 
-    def _turn_on_automatic_plugs(self):
+    def _move_into(self, src: str, dest_root: str) -> Path:
         """
-        Turn on all plugs that are set to automatic mode.
-        """
-        automatic_plugs = [
-            plug
-            for plug in self.webui.plugs.values()
-            if plug.get("mode") == "automatic"
-            and plug.get("status") == "connected"
-        ]
+        Move a file into a folder.
 
-        if not automatic_plugs:
-            logger.debug("No automatic plugs to turn on")
-            return
+        The folders are created at startup, so the folder is only created
+        here if it went missing since.
+
+        Arguments:
+            src -- The path of the file to move.
+            dest_root -- The folder to move the file into.
 
-        logger.info("Turning on %d automatic plug(s)", len(automatic_plugs))
-        for plug in automatic_plugs:
-            self._control_plug_switch(plug, True)
+        Returns:
+            The new path of the file.
+        """
+        dest_path = Path(dest_root) / Path(src).name
+        try:
+            shutil.move(src, dest_path)
+        except FileNotFoundError:
+            Path(dest_root).mkdir(parents=True, exist_ok=True)
+            shutil.move(src, dest_path)
+        return dest_path
 
-    def _turn_off_automatic_plugs(self):
+    def _get_automatic_plugs(self) -> list[PlugInfo]:
         """
-        Turn off all plugs that are set to automatic mode.
+        Get all connected plugs that are set to automatic mode.
         """
-        automatic_plugs = [
+        return [
             plug
             for plug in self.webui.plugs.values()
             if plug.get("mode") == "automatic"
             and plug.get("status") == "connected"
         ]
 
-        if not automatic_plugs:
-            logger.debug("No automatic plugs to turn off")
+    def _set_automatic_plugs(self, plugs: list[PlugInfo], on_state: bool):
+        """
+        Switch the given automatic plugs, all plugs at once.
+
+        Arguments:
+            plugs -- The automatic plugs to switch
+            on_state -- True to turn on, False to turn off
+        """
+        state = "on" if on_state else "off"
+        if not plugs:
+            logger.debug("No automatic plugs to turn %s", state)
             return
 
-        logger.info("Turning off %d automatic plug(s)", len(automatic_plugs))
-        for plug in automatic_plugs:
-            self._control_plug_switch(plug, False)
+        logger.info("Turning %s %d automatic plug(s)", state, len(plugs))
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PLUG_WORKERS, len(plugs))
+        ) as pool:
+            list(
+                pool.map(
+                    self._control_plug_switch, plugs, [on_state] * len(plugs)
+                )
+            )
 
     def _control_plug_switch(self, plug: PlugInfo, on_state: bool):
         """
@@ -618,21 +750,17 @@ def main(options: argparse.Namespace, presets: Settings):
     # must be initialized for the first time on the main thread: doing so
     # lazily inside a short-lived per-file worker thread has been observed
     # to cause native segfaults.
-    lock = acquire_lock()
-    cache_model_two_stage(
-        yolo_model_filename=presets.yolo_model_filename,
-        classifier_model_filename=presets.classifier_model_filename,
-        print_progress=presets.print_download_progress,
-        warm=True,
-    )
-    lock.release()
+    cache_models(presets, warm=True)
 
     manager.start_all()
 
+    shutdown_event = threading.Event()
+
     def handle_termination(signum, frame):  # pylint: disable=unused-argument
         logger.info("Received termination signal (%d). Stopping...", signum)
         manager.stop_all()
         logger.info("Stopped watching folders.")
+        shutdown_event.set()
         sys.exit(0)
 
     signal.signal(signal.SIGTERM, handle_termination)
@@ -641,8 +769,8 @@ def main(options: argparse.Namespace, presets: Settings):
     logger.info("Pumaguard version %s started", __version__)
 
     try:
-        while True:
-            time.sleep(1)
+        # Block until a signal arrives instead of waking up periodically
+        shutdown_event.wait()
     except KeyboardInterrupt:
         manager.stop_all()
         webui.stop()
@@ -5,6 +5,7 @@ This module provides common functions for interacting with Shelly Gen2 devices
 via their RPC API, used by both the server and web routes.
 """
 
+import functools
 import logging
 from typing import (
     Dict,
@@ -13,9 +14,34 @@ from typing import (
 )
 
 import requests
+from requests.adapters import (
+    HTTPAdapter,
+)
 
 logger = logging.getLogger(__name__)
 
+# Number of plugs whose keep-alive connections are kept open
+HTTP_POOL_CONNECTIONS = 32
+
+
+@functools.cache
+def get_shelly_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all requests to Shelly plugs.
+
+    Heartbeat checks and switch control reuse the same keep-alive
+    connections to each plug.
+
+    Returns:
+        Session with a connection pool mounted for http://
+    """
+    session = requests.Session()
+    session.mount(
+        "http://",
+        HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, max_retries=0),
+    )
+    return session
+
 
 def set_shelly_switch(
     ip_address: str,
@@ -66,7 +92,7 @@ def set_shelly_switch(
             ip_address,
         )
 
-        response = requests.get(shelly_url, timeout=timeout)
+        response = get_shelly_session().get(shelly_url, timeout=timeout)
         response.raise_for_status()
 
         # Parse response data
@@ -146,7 +172,7 @@ def get_shelly_status(
             "Getting status for plug '%s' at %s", hostname, ip_address
         )
 
-        response = requests.get(shelly_url, timeout=timeout)
+        response = get_shelly_session().get(shelly_url, timeout=timeout)
         response.raise_for_status()
 
         # Parse response data
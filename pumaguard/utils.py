@@ -127,28 +127,16 @@ def get_md5(filepath: str) -> str:
     """
     Compute the MD5 hash for a file.
     """
-    hasher = hashlib.md5()
     with open(filepath, "rb") as f:
-        while True:
-            data = f.read(65536)
-            if not data:
-                break
-            hasher.update(data)
-    return hasher.hexdigest()
+        return hashlib.file_digest(f, "md5").hexdigest()
 
 
 def get_sha256(filepath: str) -> str:
     """
     Compute the SHA-256 hash for a file.
     """
-    hasher = hashlib.sha256()
     with open(filepath, "rb") as f:
-        while True:
-            data = f.read(65536)
-            if not data:
-                break
-            hasher.update(data)
-    return hasher.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
 def classify_image(presets: Settings, image_path: str) -> float:
@@ -242,6 +230,27 @@ def prepare_image(img_path: str, image_dimensions: Tuple[int, int]):
     return img_array
 
 
+def load_image_rgb(image_path: str) -> PIL.Image.Image:
+    """
+    Load an image and convert it to RGB.
+
+    Truncated images (e.g. from an interrupted camera upload) are loaded
+    as far as they go instead of failing.
+
+    Args:
+        image_path: Path to the image file.
+
+    Returns:
+        The decoded RGB image.
+    """
+    PIL.ImageFile.LOAD_TRUNCATED_IMAGES = True
+    try:
+        with PIL.Image.open(image_path) as img:
+            return img.convert("RGB")
+    finally:
+        PIL.ImageFile.LOAD_TRUNCATED_IMAGES = False
+
+
 def cache_model_two_stage(
     yolo_model_filename: str,
     classifier_model_filename: str,
@@ -285,6 +294,7 @@ def classify_image_two_stage(
     image_path: str,
     print_progress: bool = True,
     intermediate_dir: str | None = None,
+    image: PIL.Image.Image | None = None,
 ) -> float:
     """
     Classify the image using two-stage approach: YOLO detection + EfficientNet
@@ -300,6 +310,9 @@ def classify_image_two_stage(
         print_progress (bool): Whether to print model download progress.
         intermediate_dir (str | None): If provided, store visualization and
         CSV summaries inside this directory instead of CWD.
+        image (PIL.Image.Image | None): The already decoded RGB image, e.g.
+        from ``load_image_rgb``. If provided, the image is not loaded from
+        ``image_path`` again.
 
     Returns:
         float: Maximum puma probability from all detections
@@ -353,26 +366,24 @@ def classify_image_two_stage(
     classifier = get_cached_model("classifier", classifier_model_path)
     best_t = presets.puma_threshold
 
-    start_time = datetime.datetime.now()
     image_file = Path(image_path)
-    if not image_file.exists():
-        logger.error("Could not find file %s", image_file)
-        raise FileNotFoundError(f"Could not find file {image_file}")
-    try:
-        PIL.ImageFile.LOAD_TRUNCATED_IMAGES = True
-        with PIL.Image.open(image_path) as img:
-            image = img.convert("RGB")
-        PIL.ImageFile.LOAD_TRUNCATED_IMAGES = False
-        width, height = image.size
-    except FileNotFoundError:
-        logger.error("Could not find file %s", image_file)
-        raise
-    end_time = datetime.datetime.now()
-    logger.debug(
-        "Loading of image %s took %.6f seconds",
-        image_path,
-        get_duration(start_time, end_time),
-    )
+    if image is None:
+        start_time = datetime.datetime.now()
+        if not image_file.exists():
+            logger.error("Could not find file %s", image_file)
+            raise FileNotFoundError(f"Could not find file {image_file}")
+        try:
+            image = load_image_rgb(image_path)
+        except FileNotFoundError:
+            logger.error("Could not find file %s", image_file)
+            raise
+        end_time = datetime.datetime.now()
+        logger.debug(
+            "Loading of image %s took %.6f seconds",
+            image_path,
+            get_duration(start_time, end_time),
+        )
+    width, height = image.size
 
     start_time = datetime.datetime.now()
     res = detector.predict(
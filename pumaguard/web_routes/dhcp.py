@@ -39,6 +39,7 @@ from flask import (
 )
 
 from pumaguard.shelly_control import (
+    get_shelly_session,
     set_shelly_switch,
 )
 
@@ -607,6 +608,9 @@ def register_dhcp_routes(
                 "camera_added", dict(webui.cameras[mac_address])
             )
 
+            # Confirm the camera's status without waiting for the interval
+            webui.heartbeat.trigger_check()
+
             return (
                 jsonify(
                     {
@@ -886,6 +890,9 @@ def register_dhcp_routes(
             # Notify SSE clients
             notify_camera_change("plug_added", dict(webui.plugs[mac_address]))
 
+            # Confirm the plug's status without waiting for the interval
+            webui.plug_heartbeat.trigger_check()
+
             return (
                 jsonify(
                     {
@@ -1037,7 +1044,9 @@ def register_dhcp_routes(
                             "ON" if desired_state else "OFF",
                         )
 
-                        response = requests.get(shelly_url, timeout=5)
+                        response = get_shelly_session().get(
+                            shelly_url, timeout=5
+                        )
                         response.raise_for_status()
 
                         logger.info(
@@ -1194,7 +1203,7 @@ def register_dhcp_routes(
                 shelly_url,
             )
 
-            response = requests.get(shelly_url, timeout=5)
+            response = get_shelly_session().get(shelly_url, timeout=5)
             response.raise_for_status()
 
             shelly_data = response.json()
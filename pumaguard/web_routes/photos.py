@@ -85,6 +85,12 @@ def generate_thumbnail(
                 return thumb_path
 
         with Image.open(source_path) as img_file:
+            # Let JPEG decoding scale down by 1/2, 1/4 or 1/8 while keeping
+            # at least twice the requested size, the same margin thumbnail()
+            # keeps for resampling quality. thumbnail() would draft RGB
+            # images by itself, but convert() below loads other modes at
+            # full size first. This is a no-op for other formats.
+            img_file.draft(None, (2 * max_width, 2 * max_height))
             # Convert palette / RGBA modes to RGB so JPEG encoding works.
             # Use a separate variable so mypy keeps the ImageFile / Image
             # types distinct (convert() returns the base Image, not ImageFile).
@@ -2,10 +2,18 @@
 
 # pylint: disable=redefined-outer-name
 # pylint: disable=protected-access
+# pylint: disable=too-many-lines
 # Pytest fixtures intentionally redefine names
 # Tests need to access protected members for verification
 
+import asyncio
+import logging
+import socket
+import struct
 import time
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
 from datetime import (
     datetime,
     timedelta,
@@ -15,6 +23,7 @@ from subprocess import (
     TimeoutExpired,
 )
 from unittest.mock import (
+    AsyncMock,
     MagicMock,
     patch,
 )
@@ -23,6 +32,13 @@ import pytest
 
 from pumaguard.camera_heartbeat import (
     CameraHeartbeat,
+    _build_icmp_echo,
+    _icmp_checksum,
+    _parse_icmp_echo_reply,
+)
+from pumaguard.device_heartbeat import (
+    LAST_SEEN_SAVE_INTERVAL,
+    _parse_last_seen,
 )
 from pumaguard.presets import (
     Settings,
@@ -105,6 +121,7 @@ def test_check_icmp_success(mock_run, mock_webui):
     """Test successful ICMP ping."""
     mock_run.return_value = MagicMock(returncode=0)
     heartbeat = CameraHeartbeat(mock_webui)
+    heartbeat._icmp_socket_supported = False
 
     result = heartbeat._check_icmp("192.168.52.101")
 
@@ -122,6 +139,7 @@ def test_check_icmp_failure(mock_run, mock_webui):
     """Test failed ICMP ping."""
     mock_run.return_value = MagicMock(returncode=1)
     heartbeat = CameraHeartbeat(mock_webui)
+    heartbeat._icmp_socket_supported = False
 
     result = heartbeat._check_icmp("192.168.52.101")
 
@@ -133,12 +151,95 @@ def test_check_icmp_timeout(mock_run, mock_webui):
     """Test ICMP ping timeout."""
     mock_run.side_effect = TimeoutExpired("ping", 3)
     heartbeat = CameraHeartbeat(mock_webui)
+    heartbeat._icmp_socket_supported = False
 
     result = heartbeat._check_icmp("192.168.52.101")
 
     assert result is False
 
 
+def test_build_icmp_echo():
+    """Test ICMP Echo Request packet construction."""
+    packet = _build_icmp_echo(0x1234, 7)
+
+    assert packet[0] == 8  # Echo Request
+    assert packet[1] == 0
+    assert packet[4:6] == b"\x12\x34"
+    assert packet[6:8] == b"\x00\x07"
+    # A packet with a valid checksum sums to zero
+    assert _icmp_checksum(packet) == 0
+
+
+def test_parse_icmp_echo_reply():
+    """Test ICMP Echo Reply parsing with and without IPv4 header."""
+    reply = b"\x00" + _build_icmp_echo(1, 42)[1:]
+    ip_header = b"\x45" + b"\x00" * 19
+
+    assert _parse_icmp_echo_reply(reply) == 42
+    assert _parse_icmp_echo_reply(ip_header + reply) == 42
+    assert _parse_icmp_echo_reply(_build_icmp_echo(1, 42)) is None
+    assert _parse_icmp_echo_reply(b"\x00") is None
+
+
+@patch("select.select")
+@patch("socket.socket")
+def test_check_icmp_socket_success(mock_socket_class, mock_select, mock_webui):
+    """Test successful ICMP ping via datagram socket."""
+    mock_socket = MagicMock()
+    mock_socket.__enter__.return_value = mock_socket
+    mock_socket_class.return_value = mock_socket
+    mock_select.return_value = ([mock_socket], [], [])
+
+    def recvfrom(_):
+        packet = mock_socket.sendto.call_args[0][0]
+        return b"\x00" + packet[1:], ("192.168.52.101", 0)
+
+    mock_socket.recvfrom.side_effect = recvfrom
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    with patch("subprocess.run") as mock_run:
+        result = heartbeat._check_icmp("192.168.52.101")
+
+    assert result is True
+    mock_run.assert_not_called()
+    assert mock_socket.sendto.call_args[0][1] == ("192.168.52.101", 0)
+
+
+@patch("select.select")
+@patch("socket.socket")
+def test_check_icmp_socket_timeout(mock_socket_class, mock_select, mock_webui):
+    """Test ICMP ping via datagram socket without reply."""
+    mock_socket = MagicMock()
+    mock_socket.__enter__.return_value = mock_socket
+    mock_socket_class.return_value = mock_socket
+    mock_select.return_value = ([], [], [])
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    result = heartbeat._check_icmp("192.168.52.101")
+
+    assert result is False
+    mock_socket.recvfrom.assert_not_called()
+
+
+@patch("subprocess.run")
+@patch("socket.socket")
+def test_check_icmp_socket_not_permitted(
+    mock_socket_class, mock_run, mock_webui
+):
+    """Test ICMP ping falls back to ping command without socket access."""
+    mock_socket_class.side_effect = PermissionError("Operation not permitted")
+    mock_run.return_value = MagicMock(returncode=0)
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    assert heartbeat._check_icmp("192.168.52.101") is True
+    assert heartbeat._check_icmp("192.168.52.101") is True
+
+    assert heartbeat._icmp_socket_supported is False
+    # Socket creation is only attempted once
+    mock_socket_class.assert_called_once()
+    assert mock_run.call_count == 2
+
+
 @patch("socket.socket")
 def test_check_tcp_success(mock_socket_class, mock_webui):
     """Test successful TCP connection."""
@@ -152,6 +253,10 @@ def test_check_tcp_success(mock_socket_class, mock_webui):
     assert result is True
     mock_socket.connect_ex.assert_called_once_with(("192.168.52.101", 80))
     mock_socket.close.assert_called_once()
+    # Probe connections are reset on close to avoid TIME_WAIT sockets
+    mock_socket.setsockopt.assert_called_once_with(
+        socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+    )
 
 
 @patch("socket.socket")
@@ -180,6 +285,89 @@ def test_check_tcp_exception(mock_socket_class, mock_webui):
     assert result is False
 
 
+def test_check_tcp_async_success(mock_webui):
+    """Test successful asynchronous TCP connection."""
+    writer = MagicMock()
+    writer.wait_closed = AsyncMock()
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    with patch(
+        "asyncio.open_connection",
+        new=AsyncMock(return_value=(MagicMock(), writer)),
+    ) as mock_open:
+        result = asyncio.run(heartbeat._check_tcp_async("192.168.52.101", 80))
+
+    assert result is True
+    mock_open.assert_called_once_with("192.168.52.101", 80)
+    writer.close.assert_called_once()
+
+
+def test_check_tcp_async_failure(mock_webui):
+    """Test failed asynchronous TCP connection."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    with patch(
+        "asyncio.open_connection",
+        new=AsyncMock(side_effect=ConnectionRefusedError()),
+    ):
+        result = asyncio.run(heartbeat._check_tcp_async("192.168.52.101", 80))
+
+    assert result is False
+
+
+def test_check_tcp_async_timeout(mock_webui):
+    """Test asynchronous TCP connection timeout."""
+    heartbeat = CameraHeartbeat(mock_webui, tcp_timeout=0.1)
+
+    async def hang(*_):
+        await asyncio.sleep(10)
+
+    with patch("asyncio.open_connection", new=hang):
+        result = asyncio.run(heartbeat._check_tcp_async("192.168.52.101", 80))
+
+    assert result is False
+
+
+@patch("socket.getaddrinfo")
+def test_resolve_ip_address(mock_getaddrinfo, mock_webui):
+    """Test that IP addresses are used without a DNS lookup."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    assert heartbeat._resolve("192.168.52.101") == "192.168.52.101"
+    mock_getaddrinfo.assert_not_called()
+
+
+@patch("socket.getaddrinfo")
+def test_resolve_hostname_cached(mock_getaddrinfo, mock_webui):
+    """Test that resolved hostnames are cached until the TTL expires."""
+    mock_getaddrinfo.return_value = [
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.168.52.105", 0))
+    ]
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    assert heartbeat._resolve("camera.local") == "192.168.52.105"
+    assert heartbeat._resolve("camera.local") == "192.168.52.105"
+    mock_getaddrinfo.assert_called_once()
+
+    with patch("time.monotonic", return_value=time.monotonic() + 301):
+        assert heartbeat._resolve("camera.local") == "192.168.52.105"
+    assert mock_getaddrinfo.call_count == 2
+
+
+@patch("socket.getaddrinfo")
+def test_check_camera_unresolvable_hostname(mock_getaddrinfo, mock_webui):
+    """Test that cameras with unresolvable hostnames are unreachable."""
+    mock_getaddrinfo.side_effect = socket.gaierror("Name does not resolve")
+    heartbeat = CameraHeartbeat(mock_webui, check_method="both")
+
+    with patch.object(heartbeat, "_check_icmp") as mock_icmp:
+        with patch.object(heartbeat, "_check_tcp") as mock_tcp:
+            assert heartbeat.check_camera("camera.invalid") is False
+
+    mock_icmp.assert_not_called()
+    mock_tcp.assert_not_called()
+
+
 def test_check_camera_tcp_method(mock_webui):
     """Test check_camera with TCP method."""
     heartbeat = CameraHeartbeat(mock_webui, check_method="tcp")
@@ -265,6 +453,20 @@ def test_update_camera_status_reachable(mock_webui):
     assert camera["last_seen"] != "2024-01-15T10:00:00Z"  # Updated
 
 
+def test_update_camera_status_last_seen_format(mock_webui):
+    """Test that last_seen is the current UTC time in ISO format."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    before = datetime.now(timezone.utc).replace(microsecond=0)
+    heartbeat._update_camera_status("aa:bb:cc:dd:ee:02", True)
+    after = datetime.now(timezone.utc)
+
+    last_seen = mock_webui.cameras["aa:bb:cc:dd:ee:02"]["last_seen"]
+    assert last_seen.endswith("Z")
+    parsed = datetime.fromisoformat(last_seen.replace("Z", "+00:00"))
+    assert before <= parsed <= after
+
+
 def test_update_camera_status_unreachable(mock_webui):
     """Test updating camera status when unreachable."""
     heartbeat = CameraHeartbeat(mock_webui)
@@ -298,6 +500,81 @@ def test_save_camera_list(mock_webui):
     mock_webui.presets.save.assert_called_once()
 
 
+def test_save_camera_list_skips_unchanged(mock_webui):
+    """Test that an unchanged camera list is not written again."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    heartbeat._save_camera_list()
+    heartbeat._save_camera_list()
+    assert mock_webui.presets.save.call_count == 1
+
+    mock_webui.cameras["aa:bb:cc:dd:ee:02"]["status"] = "connected"
+    heartbeat._save_camera_list()
+    assert mock_webui.presets.save.call_count == 2
+
+
+def test_update_camera_status_reports_change(mock_webui):
+    """Test that status updates report whether the status changed."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    # Already disconnected, nothing to update
+    assert heartbeat._update_camera_status("aa:bb:cc:dd:ee:02", False) is False
+    assert heartbeat._update_camera_status("aa:bb:cc:dd:ee:02", True) is True
+    # Still connected, only last_seen is refreshed
+    assert heartbeat._update_camera_status("aa:bb:cc:dd:ee:02", True) is False
+    assert heartbeat._update_camera_status("aa:bb:cc:dd:ee:01", False) is True
+    # Status updates are persisted by the caller
+    mock_webui.presets.save.assert_not_called()
+
+
+def test_save_after_sweep_throttles_last_seen(mock_webui):
+    """Test that last_seen refreshes alone are not saved every sweep."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    with patch.object(heartbeat, "_save_device_list") as mock_save:
+        # Nothing changed
+        heartbeat._save_after_sweep(False, False)
+        mock_save.assert_not_called()
+
+        # First refresh is saved, the next ones only after the interval
+        heartbeat._save_after_sweep(False, True)
+        heartbeat._save_after_sweep(False, True)
+        assert mock_save.call_count == 1
+
+        # Status changes are always saved
+        heartbeat._save_after_sweep(True, True)
+        assert mock_save.call_count == 2
+
+        heartbeat._last_saved -= LAST_SEEN_SAVE_INTERVAL
+        heartbeat._save_after_sweep(False, True)
+        assert mock_save.call_count == 3
+
+
+def test_check_now_saves_once(mock_webui):
+    """Test that check_now persists all changes with a single save."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    with patch.object(heartbeat, "check_camera", return_value=True):
+        heartbeat.check_now()
+
+    mock_webui.presets.save.assert_called_once()
+
+
+def test_check_now_notifies_after_save(mock_webui):
+    """Test that status change events are sent once changes are saved."""
+    calls = []
+    mock_webui.presets.save.side_effect = lambda: calls.append("save")
+    heartbeat = CameraHeartbeat(
+        mock_webui,
+        status_change_callback=lambda event, _: calls.append(event),
+    )
+
+    with patch.object(heartbeat, "check_camera", return_value=False):
+        heartbeat.check_now()
+
+    assert calls == ["save", "camera_status_changed_offline"]
+
+
 def test_save_camera_list_exception(mock_webui):
     """Test saving camera list handles exceptions gracefully."""
     heartbeat = CameraHeartbeat(mock_webui)
@@ -312,7 +589,7 @@ def test_check_now(mock_webui):
     heartbeat = CameraHeartbeat(mock_webui)
 
     with patch.object(heartbeat, "check_camera") as mock_check:
-        mock_check.side_effect = [True, False]
+        mock_check.side_effect = lambda ip: ip == "192.168.52.101"
 
         with patch.object(heartbeat, "_save_camera_list"):
             results = heartbeat.check_now()
@@ -344,6 +621,25 @@ def test_check_now_empty_ip(mock_webui):
     assert mock_check.call_count == 2  # Only for cameras with IPs
 
 
+def test_check_now_checks_cameras_concurrently(mock_webui):
+    """Test that check_now does not check cameras one after another."""
+    heartbeat = CameraHeartbeat(mock_webui)
+
+    def slow_check(_):
+        time.sleep(0.4)
+        return True
+
+    with patch.object(heartbeat, "check_camera", side_effect=slow_check):
+        with patch.object(heartbeat, "_save_camera_list"):
+            start = time.monotonic()
+            results = heartbeat.check_now()
+            elapsed = time.monotonic() - start
+
+    assert all(results.values())
+    # Serial checks would need 0.8 seconds for both cameras
+    assert elapsed < 0.7
+
+
 def test_start_heartbeat_enabled(mock_webui):
     """Test starting heartbeat when enabled."""
     heartbeat = CameraHeartbeat(mock_webui, interval=1)
@@ -412,7 +708,9 @@ def test_monitor_loop_checks_cameras(mock_webui):
     """Test that monitor loop checks cameras periodically."""
     heartbeat = CameraHeartbeat(mock_webui, interval=0.1)
 
-    with patch.object(heartbeat, "check_camera", return_value=True):
+    with patch.object(
+        heartbeat, "_check_tcp_async", new=AsyncMock(return_value=True)
+    ):
         with patch.object(heartbeat, "_save_camera_list"):
             heartbeat.start()
 
@@ -423,6 +721,7 @@ def test_monitor_loop_checks_cameras(mock_webui):
 
     # Should have checked cameras at least once
     assert mock_webui.cameras["aa:bb:cc:dd:ee:01"]["status"] == "connected"
+    assert mock_webui.cameras["aa:bb:cc:dd:ee:02"]["status"] == "connected"
 
 
 def test_monitor_loop_handles_exceptions(mock_webui):
@@ -430,7 +729,9 @@ def test_monitor_loop_handles_exceptions(mock_webui):
     heartbeat = CameraHeartbeat(mock_webui, interval=0.1)
 
     with patch.object(
-        heartbeat, "check_camera", side_effect=Exception("Test error")
+        heartbeat,
+        "_check_tcp_async",
+        new=AsyncMock(side_effect=Exception("Test error")),
     ):
         heartbeat.start()
 
@@ -447,7 +748,9 @@ def test_monitor_loop_stops_on_event(mock_webui):
     """Test that monitor loop stops when stop event is set."""
     heartbeat = CameraHeartbeat(mock_webui, interval=10)  # Long interval
 
-    with patch.object(heartbeat, "check_camera", return_value=True):
+    with patch.object(
+        heartbeat, "_check_tcp_async", new=AsyncMock(return_value=True)
+    ):
         with patch.object(heartbeat, "_save_camera_list"):
             heartbeat.start()
 
@@ -460,6 +763,109 @@ def test_monitor_loop_stops_on_event(mock_webui):
                 assert not heartbeat._thread.is_alive()
 
 
+def test_stop_interrupts_running_sweep(mock_webui):
+    """Test that stop does not wait for checks that are in flight."""
+    heartbeat = CameraHeartbeat(mock_webui, interval=10, check_method="icmp")
+
+    def slow_check(_):
+        time.sleep(2)
+        return True
+
+    with patch.object(heartbeat, "check_camera", side_effect=slow_check):
+        with patch.object(heartbeat, "_save_camera_list"):
+            heartbeat.start()
+            time.sleep(0.2)
+
+            start = time.monotonic()
+            heartbeat.stop()
+            elapsed = time.monotonic() - start
+
+    assert elapsed < 1
+    assert heartbeat._thread is not None
+    assert not heartbeat._thread.is_alive()
+    # The interrupted sweep must not update any status
+    assert mock_webui.cameras["aa:bb:cc:dd:ee:02"]["status"] == "disconnected"
+
+
+def test_stop_interrupts_running_tcp_sweep(mock_webui):
+    """Test that stop does not wait for an asyncio TCP sweep."""
+    heartbeat = CameraHeartbeat(mock_webui, interval=10)
+
+    async def slow_check(*_):
+        await asyncio.sleep(2)
+        return True
+
+    with patch.object(heartbeat, "_check_tcp_async", new=slow_check):
+        with patch.object(heartbeat, "_save_camera_list"):
+            heartbeat.start()
+            time.sleep(0.2)
+
+            start = time.monotonic()
+            heartbeat.stop()
+            elapsed = time.monotonic() - start
+
+    assert elapsed < 1
+    assert heartbeat._thread is not None
+    assert not heartbeat._thread.is_alive()
+    assert mock_webui.cameras["aa:bb:cc:dd:ee:02"]["status"] == "disconnected"
+
+
+def test_monitor_loop_idle_without_cameras(mock_webui):
+    """Test that monitor loop does no work while there are no cameras."""
+    mock_webui.cameras.clear()
+    heartbeat = CameraHeartbeat(mock_webui, interval=0.1)
+
+    with patch.object(heartbeat, "_check_devices") as mock_check:
+        with patch.object(
+            heartbeat, "_check_and_remove_stale_devices"
+        ) as mock_stale:
+            heartbeat.start()
+            time.sleep(0.3)
+            heartbeat.stop()
+
+    mock_check.assert_not_called()
+    mock_stale.assert_not_called()
+
+
+def test_trigger_check_starts_sweep_early(mock_webui):
+    """Test that trigger_check wakes the monitor loop before the interval."""
+    heartbeat = CameraHeartbeat(mock_webui, interval=10)
+
+    with patch.object(
+        heartbeat, "_check_devices", return_value={}
+    ) as mock_check:
+        heartbeat.start()
+        time.sleep(0.2)
+        assert mock_check.call_count == 1
+
+        heartbeat.trigger_check()
+        time.sleep(0.2)
+        heartbeat.stop()
+
+    assert mock_check.call_count == 2
+
+
+def test_monitor_loop_uses_one_timestamp_per_sweep(mock_webui):
+    """Test that a sweep records the same time for all cameras."""
+    heartbeat = CameraHeartbeat(mock_webui, interval=10)
+
+    with patch.object(
+        heartbeat, "_check_tcp_async", new=AsyncMock(return_value=True)
+    ):
+        with patch.object(heartbeat, "_save_device_list"):
+            with patch.object(
+                heartbeat, "_check_and_remove_stale_devices"
+            ) as mock_stale:
+                heartbeat.start()
+                time.sleep(0.3)
+                heartbeat.stop()
+
+    first, second = mock_webui.cameras.values()
+    assert first["last_seen"] == second["last_seen"]
+    (now,) = mock_stale.call_args[0]
+    assert now.strftime("%Y-%m-%dT%H:%M:%SZ") == first["last_seen"]
+
+
 def test_monitor_loop_skips_empty_ip(mock_webui):
     """Test that monitor loop skips cameras with empty IP."""
     mock_webui.cameras["aa:bb:cc:dd:ee:03"] = {
@@ -472,9 +878,9 @@ def test_monitor_loop_skips_empty_ip(mock_webui):
 
     heartbeat = CameraHeartbeat(mock_webui, interval=0.1)
 
-    with patch.object(heartbeat, "check_camera") as mock_check:
-        mock_check.return_value = True
-
+    with patch.object(
+        heartbeat, "_check_tcp_async", new=AsyncMock(return_value=True)
+    ) as mock_check:
         with patch.object(heartbeat, "_save_camera_list"):
             heartbeat.start()
             time.sleep(0.3)
@@ -487,6 +893,163 @@ def test_monitor_loop_skips_empty_ip(mock_webui):
         assert call[0][0] != ""
 
 
+def test_monitor_loop_checks_cameras_concurrently(mock_webui):
+    """Test that one TCP sweep checks all cameras concurrently."""
+    heartbeat = CameraHeartbeat(mock_webui, interval=10)
+
+    async def slow_check(*_):
+        await asyncio.sleep(0.4)
+        return True
+
+    with patch.object(heartbeat, "_check_tcp_async", new=slow_check):
+        with patch.object(heartbeat, "_save_camera_list"):
+            heartbeat.start()
+            # Serial checks would need 0.8 seconds for both cameras
+            time.sleep(0.6)
+            statuses = [cam["status"] for cam in mock_webui.cameras.values()]
+            heartbeat.stop()
+
+    assert statuses == ["connected", "connected"]
+
+
+def test_monitor_loop_checks_cameras_concurrently_icmp(mock_webui):
+    """Test that one ICMP sweep checks all cameras on the thread pool."""
+    heartbeat = CameraHeartbeat(mock_webui, interval=10, check_method="icmp")
+
+    def slow_check(_):
+        time.sleep(0.4)
+        return True
+
+    with patch.object(heartbeat, "check_camera", side_effect=slow_check):
+        with patch.object(heartbeat, "_save_camera_list"):
+            heartbeat.start()
+            # Serial checks would need 0.8 seconds for both cameras
+            time.sleep(0.6)
+            statuses = [cam["status"] for cam in mock_webui.cameras.values()]
+            heartbeat.stop()
+
+    assert statuses == ["connected", "connected"]
+
+
+@patch("subprocess.run")
+def test_check_icmp_batch(mock_run, mock_webui):
+    """Test parsing the per-host summaries of one fping call."""
+    mock_run.return_value = MagicMock(
+        returncode=1,
+        stderr=(
+            "192.168.52.101 : xmt/rcv/%loss = 1/1/0%, "
+            "min/avg/max = 0.52/0.52/0.52\n"
+            "192.168.52.102 : xmt/rcv/%loss = 1/0/100%\n"
+        ),
+    )
+    heartbeat = CameraHeartbeat(mock_webui, check_method="icmp")
+
+    result = heartbeat._check_icmp_batch(["192.168.52.101", "192.168.52.102"])
+
+    assert result == {"192.168.52.101": True, "192.168.52.102": False}
+    mock_run.assert_called_once()
+    args = mock_run.call_args[0][0]
+    assert args[-2:] == ["192.168.52.101", "192.168.52.102"]
+    assert "-c" in args
+
+
+def test_check_devices_uses_fping_without_icmp_sockets(mock_webui):
+    """Test that a sweep runs one fping call instead of ping per camera."""
+    heartbeat = CameraHeartbeat(mock_webui, check_method="icmp")
+    heartbeat._icmp_socket_supported = False
+    heartbeat._fping = "/usr/bin/fping"
+    ip_addresses = {
+        "aa:bb:cc:dd:ee:01": "192.168.52.101",
+        "aa:bb:cc:dd:ee:02": "192.168.52.102",
+    }
+
+    with patch.object(
+        heartbeat,
+        "_check_icmp_batch",
+        return_value={"192.168.52.101": True, "192.168.52.102": False},
+    ) as mock_batch:
+        with patch.object(heartbeat, "_check_icmp_subprocess") as mock_ping:
+            with ThreadPoolExecutor() as pool:
+                result = heartbeat._check_devices(pool, ip_addresses)
+
+    assert result == {"aa:bb:cc:dd:ee:01": True, "aa:bb:cc:dd:ee:02": False}
+    mock_batch.assert_called_once_with(["192.168.52.101", "192.168.52.102"])
+    mock_ping.assert_not_called()
+
+
+def test_check_devices_both_races_icmp_and_tcp(mock_webui):
+    """Test that "both" pings and connects at the same time."""
+    heartbeat = CameraHeartbeat(mock_webui, check_method="both")
+    ip_addresses = {
+        "aa:bb:cc:dd:ee:01": "192.168.52.101",
+        "aa:bb:cc:dd:ee:02": "192.168.52.102",
+    }
+
+    def slow_icmp(ip_address):
+        time.sleep(0.4)
+        return ip_address == "192.168.52.101"
+
+    async def slow_tcp(ip_address, _port):
+        await asyncio.sleep(0.4)
+        return ip_address == "192.168.52.102"
+
+    with patch.object(heartbeat, "_check_icmp", side_effect=slow_icmp):
+        with patch.object(heartbeat, "_check_tcp_async", new=slow_tcp):
+            with ThreadPoolExecutor() as pool:
+                start = time.monotonic()
+                result = heartbeat._check_devices(pool, ip_addresses)
+                elapsed = time.monotonic() - start
+
+    assert result == {"aa:bb:cc:dd:ee:01": True, "aa:bb:cc:dd:ee:02": True}
+    # Serial fallback would need 0.8 seconds
+    assert elapsed < 0.7
+
+
+def test_check_devices_both_uses_fping(mock_webui):
+    """Test that "both" pings through fping when ICMP sockets are missing."""
+    heartbeat = CameraHeartbeat(mock_webui, check_method="both")
+    heartbeat._icmp_socket_supported = False
+    heartbeat._fping = "/usr/bin/fping"
+    ip_addresses = {
+        "aa:bb:cc:dd:ee:01": "192.168.52.101",
+        "aa:bb:cc:dd:ee:02": "192.168.52.102",
+    }
+
+    with patch.object(
+        heartbeat,
+        "_check_icmp_batch",
+        return_value={"192.168.52.101": True, "192.168.52.102": False},
+    ) as mock_batch:
+        with patch.object(
+            heartbeat, "_check_tcp_async", new=AsyncMock(return_value=False)
+        ):
+            with ThreadPoolExecutor() as pool:
+                result = heartbeat._check_devices(pool, ip_addresses)
+
+    assert result == {"aa:bb:cc:dd:ee:01": True, "aa:bb:cc:dd:ee:02": False}
+    mock_batch.assert_called_once()
+
+
+def test_check_devices_fping_failure_checks_one_by_one(mock_webui):
+    """Test that a failing fping call falls back to per-camera checks."""
+    heartbeat = CameraHeartbeat(mock_webui, check_method="icmp")
+    heartbeat._icmp_socket_supported = False
+    heartbeat._fping = "/usr/bin/fping"
+    ip_addresses = {"aa:bb:cc:dd:ee:01": "192.168.52.101"}
+
+    with patch.object(
+        heartbeat, "_check_icmp_batch", side_effect=TimeoutExpired("fping", 4)
+    ):
+        with patch.object(
+            heartbeat, "_check_icmp_subprocess", return_value=True
+        ) as mock_ping:
+            with ThreadPoolExecutor() as pool:
+                result = heartbeat._check_devices(pool, ip_addresses)
+
+    assert result == {"aa:bb:cc:dd:ee:01": True}
+    mock_ping.assert_called_once_with("192.168.52.101")
+
+
 def test_auto_removal_initialization(mock_webui):
     """Test CameraHeartbeat initialization with auto-removal settings."""
     heartbeat = CameraHeartbeat(
@@ -507,6 +1070,20 @@ def test_auto_removal_disabled_by_default(mock_webui):
     assert heartbeat.auto_remove_hours == 24
 
 
+def test_parse_last_seen():
+    """Test parsing last_seen timestamps with and without "Z"."""
+    expected = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+
+    assert _parse_last_seen("2024-01-15T10:00:00Z") == expected
+    assert _parse_last_seen("2024-01-15T10:00:00+00:00") == expected
+    # Repeated timestamps are not parsed again
+    assert _parse_last_seen("2024-01-15T10:00:00Z") is _parse_last_seen(
+        "2024-01-15T10:00:00Z"
+    )
+    with pytest.raises(ValueError):
+        _parse_last_seen("invalid")
+
+
 def test_check_and_remove_stale_cameras_removes_old_camera(mock_webui):
     """Test that stale cameras are removed after configured hours."""
     # Set current time
@@ -590,6 +1167,23 @@ def test_check_and_remove_stale_cameras_disabled(mock_webui):
     assert len(mock_webui.cameras) == initial_camera_count
 
 
+def test_check_stale_devices_skipped_when_disabled(mock_webui):
+    """Test that the stale scan is skipped without auto-removal or debug."""
+    heartbeat = CameraHeartbeat(mock_webui, auto_remove_enabled=False)
+
+    with (
+        patch("pumaguard.device_heartbeat._parse_last_seen") as mock_parse,
+        patch.object(
+            logging.getLogger("pumaguard.device_heartbeat"),
+            "isEnabledFor",
+            return_value=False,
+        ),
+    ):
+        heartbeat._check_and_remove_stale_devices()
+
+    mock_parse.assert_not_called()
+
+
 def test_check_and_remove_stale_cameras_handles_missing_last_seen(mock_webui):
     """Test that cameras without last_seen are not removed."""
     now = datetime(2024, 1, 16, 12, 0, 0, tzinfo=timezone.utc)
@@ -662,13 +1256,15 @@ def test_check_and_remove_stale_cameras_removes_multiple(mock_webui):
         mock_datetime.now.return_value = now
         mock_datetime.fromisoformat = datetime.fromisoformat
 
-        with patch.object(heartbeat, "_save_camera_list"):
+        with patch.object(heartbeat, "_save_device_list") as mock_save:
             heartbeat._check_and_remove_stale_cameras()
 
     # Both cameras should be removed
     assert len(mock_webui.cameras) == 0
     # Callback should be called twice
     assert callback.call_count == 2
+    # Both removals are saved together
+    mock_save.assert_called_once()
 
 
 def test_check_and_remove_stale_cameras_handles_callback_exception(
@@ -711,7 +1307,9 @@ def test_monitor_loop_calls_auto_removal(mock_webui):
         auto_remove_hours=24,
     )
 
-    with patch.object(heartbeat, "check_camera", return_value=True):
+    with patch.object(
+        heartbeat, "_check_tcp_async", new=AsyncMock(return_value=True)
+    ):
         with patch.object(heartbeat, "_save_camera_list"):
             with patch.object(
                 heartbeat, "_check_and_remove_stale_devices"
@@ -7,6 +7,10 @@ from unittest.mock import (
     patch,
 )
 
+from PIL import (
+    Image,
+)
+
 from pumaguard.classify import (
     configure_subparser,
     main,
@@ -62,7 +66,7 @@ class TestMain:
         main(options, presets)
 
         mock_classify.assert_called_once_with(
-            presets=presets, image_path="test_image.jpg"
+            presets=presets, image_path="test_image.jpg", image=None
         )
 
         captured = capsys.readouterr()
@@ -82,7 +86,7 @@ class TestMain:
         main(options, presets)
 
         mock_classify.assert_called_once_with(
-            presets=presets, image_path="test_image.jpg"
+            presets=presets, image_path="test_image.jpg", image=None
         )
 
         captured = capsys.readouterr()
@@ -231,9 +235,31 @@ class TestMain:
         main(options, presets)
 
         mock_classify.assert_called_once_with(
-            presets=presets, image_path=image_path
+            presets=presets, image_path=image_path, image=None
         )
 
+    @patch("pumaguard.classify.classify_image_two_stage")
+    def test_main_passes_prefetched_images(self, mock_classify, tmp_path):
+        """Test main hands the decoded images to the classifier."""
+        mock_classify.return_value = 0.5
+        presets = MagicMock(spec=Settings)
+        image_paths = []
+        for index, size in enumerate([(32, 16), (8, 24)]):
+            image_path = tmp_path / f"image{index}.png"
+            Image.new("L", size).save(image_path)
+            image_paths.append(str(image_path))
+
+        options = argparse.Namespace(image=image_paths)
+        main(options, presets)
+
+        assert mock_classify.call_count == 2
+        for call, image_path, size in zip(
+            mock_classify.call_args_list, image_paths, [(32, 16), (8, 24)]
+        ):
+            assert call.kwargs["image_path"] == image_path
+            assert call.kwargs["image"].mode == "RGB"
+            assert call.kwargs["image"].size == size
+
     @patch("pumaguard.classify.logger")
     @patch("pumaguard.classify.classify_image_two_stage")
     def test_main_logs_debug_message(self, mock_classify, mock_logger):
@@ -51,6 +51,7 @@ def test_app(mock_preset):
     webui.presets = mock_preset
     webui.presets.plugs = []
     webui.heartbeat = MagicMock()
+    webui.plug_heartbeat = MagicMock()
 
     register_dhcp_routes(app, webui)
 
@@ -286,6 +287,9 @@ def test_add_camera_manually(test_app):
     assert len(webui.presets.cameras) == 1
     webui.presets.save.assert_called()
 
+    # Verify the new camera is checked right away
+    webui.heartbeat.trigger_check.assert_called_once()
+
 
 def test_add_camera_missing_fields(test_app):
     """Test adding a camera with missing required fields."""
@@ -1019,6 +1023,9 @@ def test_add_plug_manually(test_app):
     assert len(webui.presets.plugs) == 1
     webui.presets.save.assert_called()
 
+    # Verify the new plug is checked right away
+    webui.plug_heartbeat.trigger_check.assert_called_once()
+
 
 def test_add_plug_missing_fields(test_app):
     """Test adding a plug with missing required fields."""
@@ -1142,7 +1149,7 @@ def test_dhcp_event_unknown_device(test_app):
     assert "99:88:77:66:55:44" not in webui.plugs
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_get_shelly_status_success(mock_get, test_app):
     """Test getting Shelly status for a connected plug."""
     app, webui = test_app
@@ -1195,7 +1202,7 @@ def test_get_shelly_status_success(mock_get, test_app):
     )
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_get_shelly_status_plug_not_found(mock_get, test_app):
     """Test getting Shelly status for a non-existent plug."""
     app, _webui = test_app
@@ -1212,7 +1219,7 @@ def test_get_shelly_status_plug_not_found(mock_get, test_app):
     mock_get.assert_not_called()
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_get_shelly_status_plug_disconnected(mock_get, test_app):
     """Test getting Shelly status for a disconnected plug."""
     app, webui = test_app
@@ -1239,7 +1246,7 @@ def test_get_shelly_status_plug_disconnected(mock_get, test_app):
     mock_get.assert_not_called()
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_get_shelly_status_timeout(mock_get, test_app):
     """Test getting Shelly status when request times out."""
     app, webui = test_app
@@ -1266,7 +1273,7 @@ def test_get_shelly_status_timeout(mock_get, test_app):
     assert data["error"] == "Timeout connecting to plug"
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_get_shelly_status_connection_error(mock_get, test_app):
     """Test getting Shelly status when connection fails."""
     app, webui = test_app
@@ -1295,7 +1302,7 @@ def test_get_shelly_status_connection_error(mock_get, test_app):
     assert "Failed to fetch Shelly status" in data["error"]
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_set_plug_switch_on_success(mock_get, test_app):
     """Test turning plug switch ON successfully."""
     app, webui = test_app
@@ -1337,7 +1344,7 @@ def test_set_plug_switch_on_success(mock_get, test_app):
     )
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_set_plug_switch_off_success(mock_get, test_app):
     """Test turning plug switch OFF successfully."""
     app, webui = test_app
@@ -1497,7 +1504,7 @@ def test_set_plug_switch_plug_disconnected(test_app):
     assert "Plug is not connected" in data["error"]
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_set_plug_switch_timeout(mock_get, test_app):
     """Test setting plug switch when connection times out."""
     app, webui = test_app
@@ -1527,7 +1534,7 @@ def test_set_plug_switch_timeout(mock_get, test_app):
     assert "Timeout connecting to plug" in data["error"]
 
 
-@patch("pumaguard.web_routes.dhcp.requests.get")
+@patch("requests.Session.get")
 def test_set_plug_switch_connection_error(mock_get, test_app):
     """Test setting plug switch when connection fails."""
     app, webui = test_app
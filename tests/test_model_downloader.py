@@ -510,6 +510,37 @@ def test_ensure_model_available_already_cached(tmp_path):
                 assert model_path.exists()
 
 
+def test_ensure_model_available_verifies_unchanged_model_once(tmp_path):
+    """Test that an unchanged model file is only hashed once."""
+    test_model = "test_verified.h5"
+    test_content = b"verified model"
+    test_hash = hashlib.sha256(test_content).hexdigest()
+    model_path = tmp_path / test_model
+    model_path.write_bytes(test_content)
+
+    with patch.dict(
+        "pumaguard.model_downloader.MODEL_REGISTRY",
+        {test_model: {"sha256": test_hash}},
+    ):
+        with patch(
+            "pumaguard.model_downloader.get_models_directory",
+            return_value=tmp_path,
+        ):
+            with patch(
+                "pumaguard.model_downloader.verify_file_checksum",
+                wraps=verify_file_checksum,
+            ) as mock_verify:
+                assert ensure_model_available(test_model) == model_path
+                assert ensure_model_available(test_model) == model_path
+                assert mock_verify.call_count == 1
+
+                # A replaced file is verified again
+                model_path.unlink()
+                model_path.write_bytes(test_content)
+                assert ensure_model_available(test_model) == model_path
+                assert mock_verify.call_count == 2
+
+
 def test_ensure_model_available_invalid_model_name():
     """Test ensure_model_available raises ValueError for unknown model."""
     with pytest.raises(ValueError, match="Unknown model"):
@@ -17,8 +17,12 @@ import pytest
 from flask import (
     Flask,
 )
+from PIL import (
+    Image,
+)
 
 from pumaguard.web_routes.photos import (
+    generate_thumbnail,
     register_photos_routes,
 )
 
@@ -588,9 +592,7 @@ class TestDeletePhotosBulk:
                 filename, encoding="utf-8"
             )
 
-        response = test_client.delete(
-            "/api/photos", json={"paths": filenames}
-        )
+        response = test_client.delete("/api/photos", json={"paths": filenames})
         assert response.status_code == 200
 
         notification_callback.assert_called_once()
@@ -645,3 +647,46 @@ class TestDeletePhotosBulk:
 
         # Both thumbnails should have been removed.
         assert os.listdir(thumb_dir) == []
+
+
+class TestGenerateThumbnail:
+    """Test thumbnail generation."""
+
+    def test_generate_thumbnail_large_jpeg(self, temp_dirs):
+        """Test that a large JPEG is reduced to fit the requested size."""
+        tmpdir1, _ = temp_dirs
+        source = os.path.join(tmpdir1, "large.jpg")
+        Image.new("RGB", (2000, 1500), color=(200, 100, 50)).save(source)
+
+        thumb_path = generate_thumbnail(source, 320, 320)
+
+        assert thumb_path is not None
+        with Image.open(thumb_path) as thumb:
+            assert thumb.size == (320, 240)
+            assert thumb.mode == "RGB"
+
+    def test_generate_thumbnail_png(self, temp_dirs):
+        """Test that non-JPEG sources with alpha are converted to RGB."""
+        tmpdir1, _ = temp_dirs
+        source = os.path.join(tmpdir1, "alpha.png")
+        Image.new("RGBA", (640, 480), color=(0, 0, 255, 128)).save(source)
+
+        thumb_path = generate_thumbnail(source, 160, 160)
+
+        assert thumb_path is not None
+        with Image.open(thumb_path) as thumb:
+            assert thumb.size == (160, 120)
+            assert thumb.mode == "RGB"
+
+    def test_generate_thumbnail_cmyk_jpeg(self, temp_dirs):
+        """Test that a CMYK JPEG is reduced and converted to RGB."""
+        tmpdir1, _ = temp_dirs
+        source = os.path.join(tmpdir1, "cmyk.jpg")
+        Image.new("CMYK", (2000, 1500), color=(0, 50, 100, 0)).save(source)
+
+        thumb_path = generate_thumbnail(source, 320, 320)
+
+        assert thumb_path is not None
+        with Image.open(thumb_path) as thumb:
+            assert thumb.size == (320, 240)
+            assert thumb.mode == "RGB"
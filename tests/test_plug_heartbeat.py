@@ -68,7 +68,7 @@ class TestPlugHeartbeat(unittest.TestCase):
         assert heartbeat.enabled is True
         assert heartbeat.timeout == 5
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_check_http_success(self, mock_get):
         """Test HTTP check with successful response."""
         heartbeat = PlugHeartbeat(self.webui)
@@ -76,17 +76,31 @@ class TestPlugHeartbeat(unittest.TestCase):
         # Mock successful response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"output": True, "apower": 50.0}
+        mock_response.iter_content.return_value = iter(
+            [b'{"id": "shellyplugus-aabbccddeeff", "mac": "AABBCCDDEEFF"}']
+        )
         mock_get.return_value = mock_response
 
         result = heartbeat._check_http("192.168.1.200")
 
         assert result is True
-        mock_get.assert_called_once_with(
-            "http://192.168.1.200/rpc/Switch.GetStatus?id=0", timeout=5
-        )
+        mock_get.assert_called_once()
+        (request,) = mock_get.call_args.args
+        assert request.method == "GET"
+        assert request.url == "http://192.168.1.200/shelly"
+        assert mock_get.call_args.kwargs == {"timeout": 5, "stream": True}
+        mock_response.close.assert_called_once()
+
+    def test_liveness_request_prepared_once(self):
+        """Test that each plug's liveness request is only prepared once."""
+        heartbeat = PlugHeartbeat(self.webui)
+
+        request = heartbeat._get_liveness_request("192.168.1.200")
+
+        assert heartbeat._get_liveness_request("192.168.1.200") is request
+        assert heartbeat._get_liveness_request("192.168.1.201") is not request
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_check_http_timeout(self, mock_get):
         """Test HTTP check with timeout."""
         heartbeat = PlugHeartbeat(self.webui)
@@ -96,7 +110,7 @@ class TestPlugHeartbeat(unittest.TestCase):
 
         assert result is False
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_check_http_connection_error(self, mock_get):
         """Test HTTP check with connection error."""
         heartbeat = PlugHeartbeat(self.webui)
@@ -106,29 +120,33 @@ class TestPlugHeartbeat(unittest.TestCase):
 
         assert result is False
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_check_http_invalid_response(self, mock_get):
         """Test HTTP check with invalid JSON response."""
         heartbeat = PlugHeartbeat(self.webui)
 
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"invalid": "data"}
+        mock_response.iter_content.return_value = iter(
+            [b'{"invalid": "data"}']
+        )
         mock_get.return_value = mock_response
 
         result = heartbeat._check_http("192.168.1.200")
 
-        # Should return False because "output" key is missing
+        # Should return False because "mac" key is missing
         assert result is False
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_check_plug(self, mock_get):
         """Test check_plug method."""
         heartbeat = PlugHeartbeat(self.webui)
 
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"output": True}
+        mock_response.iter_content.side_effect = lambda _: iter(
+            [b'{"mac": "AABBCCDDEEFF"}']
+        )
         mock_get.return_value = mock_response
 
         result = heartbeat.check_plug("192.168.1.200")
@@ -196,6 +214,18 @@ class TestPlugHeartbeat(unittest.TestCase):
         assert len(self.webui.presets.plugs) == 2
         self.webui.presets.save.assert_called_once()
 
+    def test_save_plug_list_skips_unchanged(self):
+        """Test that an unchanged plug list is not written again."""
+        heartbeat = PlugHeartbeat(self.webui)
+
+        heartbeat._save_plug_list()
+        heartbeat._save_plug_list()
+        assert self.webui.presets.save.call_count == 1
+
+        self.webui.plugs["aa:bb:cc:dd:ee:ff"]["mode"] = "on"
+        heartbeat._save_plug_list()
+        assert self.webui.presets.save.call_count == 2
+
     def test_save_plug_list_exception(self):
         """Test saving plug list handles exceptions gracefully."""
         heartbeat = PlugHeartbeat(self.webui)
@@ -204,7 +234,7 @@ class TestPlugHeartbeat(unittest.TestCase):
         # Should not raise exception
         heartbeat._save_plug_list()
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_check_now(self, mock_get):
         """Test check_now method checks all plugs."""
         heartbeat = PlugHeartbeat(self.webui)
@@ -212,7 +242,9 @@ class TestPlugHeartbeat(unittest.TestCase):
         # Mock responses for both plugs
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"output": True}
+        mock_response.iter_content.side_effect = lambda _: iter(
+            [b'{"mac": "AABBCCDDEEFF"}']
+        )
         mock_get.return_value = mock_response
 
         with patch.object(heartbeat, "_update_plug_status"):
@@ -276,7 +308,7 @@ class TestPlugHeartbeat(unittest.TestCase):
         # Should not raise exception
         heartbeat.stop()
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_monitor_loop_checks_plugs(self, mock_get):
         """Test monitor loop checks all plugs."""
         heartbeat = PlugHeartbeat(self.webui, interval=1)
@@ -284,7 +316,9 @@ class TestPlugHeartbeat(unittest.TestCase):
         # Mock successful response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"output": True}
+        mock_response.iter_content.side_effect = lambda _: iter(
+            [b'{"mac": "AABBCCDDEEFF"}']
+        )
         mock_get.return_value = mock_response
 
         with patch.object(heartbeat, "_save_plug_list"):
@@ -320,7 +354,7 @@ class TestPlugHeartbeat(unittest.TestCase):
         plug = self.webui.plugs["aa:bb:cc:dd:ee:ff"]
         assert plug["mode"] == "automatic"  # Mode preserved
 
-    @patch("requests.get")
+    @patch("requests.Session.send")
     def test_check_now_empty_ip(self, mock_get):
         """Test check_now handles plugs with empty IP addresses."""
         heartbeat = PlugHeartbeat(self.webui)
@@ -328,7 +362,9 @@ class TestPlugHeartbeat(unittest.TestCase):
         # Mock successful response for other plugs
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"output": True}
+        mock_response.iter_content.side_effect = lambda _: iter(
+            [b'{"mac": "AABBCCDDEEFF"}']
+        )
         mock_get.return_value = mock_response
 
         # Add plug with empty IP
@@ -3,7 +3,9 @@ Test Presets class
 """
 
 import os
+import stat
 import tempfile
+import threading
 import unittest
 from pathlib import (
     Path,
@@ -98,6 +100,27 @@ no-lion-directories:
         new_callable=mock_open,
         read_data="""
 image-dimensions: [128, 128]
+validation-no-lion-directories: /path/to/no_lion
+""",
+    )
+    def test_load_invalid_directories(
+        self, mock_file
+    ):  # pylint: disable=unused-argument
+        """
+        Test that directory settings must be lists of paths.
+        """
+        with self.assertRaises(ValueError) as error:
+            self.base_preset.load("/fake/path/to/settings.yaml")
+        self.assertEqual(
+            str(error.exception),
+            "expected validation-no-lion-directories to be a list of paths",
+        )
+
+    @patch(
+        "builtins.open",
+        new_callable=mock_open,
+        read_data="""
+image-dimensions: [128, 128]
 cameras:
     - hostname: camera1
       ip_address: 192.168.1.100
@@ -498,6 +521,50 @@ puma-threshold: 0.75
         self.assertEqual(serialized["puma-threshold"], 0.65)
 
 
+class TestPresetLoadCache(unittest.TestCase):
+    """
+    Test that parsed settings files are reused until they change.
+    """
+
+    def test_load_reuses_parsed_file(self):
+        """Test that an unchanged settings file is parsed only once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_file = os.path.join(tmpdir, "settings.yaml")
+            preset = Settings()
+            preset.settings_file = settings_file
+            preset.epochs = 7
+            preset.save()
+
+            with patch("pumaguard.presets.yaml.load", wraps=yaml.load) as load:
+                first = Settings()
+                first.load(settings_file)
+                first.cameras.append({"hostname": "camera1"})
+                second = Settings()
+                second.load(settings_file)
+
+            self.assertEqual(load.call_count, 1)
+            self.assertEqual(second.epochs, 7)
+            # Each load gets its own copy of the settings
+            self.assertEqual(second.cameras, [])
+
+    def test_load_parses_changed_file(self):
+        """Test that a changed settings file is parsed again."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_file = os.path.join(tmpdir, "settings.yaml")
+            preset = Settings()
+            preset.settings_file = settings_file
+            preset.epochs = 7
+            preset.save()
+            preset.load(settings_file)
+
+            preset.epochs = 300
+            preset.save()
+            reloaded = Settings()
+            reloaded.load(settings_file)
+
+            self.assertEqual(reloaded.epochs, 300)
+
+
 class TestPresetSave(unittest.TestCase):
     """
     Test the Preset.save() method writes to disk correctly.
@@ -538,6 +605,65 @@ class TestPresetSave(unittest.TestCase):
             if Path(settings_file).exists():
                 Path(settings_file).unlink()
 
+    def test_save_replaces_settings_file(self):
+        """Test that save() leaves no temporary file and keeps symlinks."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = os.path.join(tmpdir, "settings.yaml")
+            link = os.path.join(tmpdir, "link.yaml")
+            Path(target).write_text("epochs: 1\n", encoding="utf-8")
+            os.symlink(target, link)
+
+            self.preset.settings_file = link
+            self.preset.epochs = 42
+            self.preset.save()
+
+            self.assertTrue(os.path.islink(link))
+            self.assertEqual(
+                sorted(os.listdir(tmpdir)), ["link.yaml", "settings.yaml"]
+            )
+            with open(target, encoding="utf-8") as f:
+                saved_data = yaml.safe_load(f)
+            self.assertEqual(saved_data["epochs"], 42)
+
+    def test_save_keeps_permissions(self):
+        """Test that save() keeps the permissions of the settings file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_file = os.path.join(tmpdir, "settings.yaml")
+            Path(settings_file).write_text("epochs: 1\n", encoding="utf-8")
+            os.chmod(settings_file, 0o640)
+
+            self.preset.settings_file = settings_file
+            self.preset.save()
+
+            self.assertEqual(
+                stat.S_IMODE(os.stat(settings_file).st_mode), 0o640
+            )
+
+    def test_save_concurrently(self):
+        """Test that concurrent saves do not interfere with each other."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings_file = os.path.join(tmpdir, "settings.yaml")
+            self.preset.settings_file = settings_file
+            errors = []
+
+            def save():
+                try:
+                    for _ in range(10):
+                        self.preset.save()
+                except Exception as e:  # pylint: disable=broad-except
+                    errors.append(e)
+
+            threads = [threading.Thread(target=save) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(os.listdir(tmpdir), ["settings.yaml"])
+            with open(settings_file, encoding="utf-8") as f:
+                self.assertIsNotNone(yaml.safe_load(f))
+
     def test_save_persists_cameras(self):
         """Test that save() persists camera list."""
         with tempfile.NamedTemporaryFile(
@@ -12,9 +12,12 @@ Test server.
 # pyright: reportPrivateUsage=false
 # pyright: reportAttributeAccessIssue=false
 
+# pylint: disable=too-many-lines
+
 import io
 import os
 import tempfile
+import time
 import unittest
 from unittest.mock import (
     MagicMock,
@@ -26,9 +29,13 @@ from PIL import (
     Image,
 )
 
+from pumaguard import (
+    server,
+)
 from pumaguard.server import (
     FolderManager,
     FolderObserver,
+    cache_models,
 )
 from pumaguard.utils import (
     Settings,
@@ -52,13 +59,13 @@ class TestFolderObserver(unittest.TestCase):
         self.observer = FolderObserver(
             self.folder, "inotify", self.presets, self.mock_webui
         )
+        server._CACHED_MODELS.clear()  # pylint: disable=protected-access
 
     @patch("pumaguard.server.acquire_lock")
     @patch("pumaguard.server.cache_model_two_stage")
     @patch("pumaguard.server.subprocess.Popen")
-    @patch("pumaguard.server.threading.Thread")
     def test_observe_new_file(
-        self, MockThread, MockPopen, mock_cache, mock_lock
+        self, MockPopen, mock_cache, mock_lock
     ):  # pylint: disable=invalid-name
         """
         Test observing a new file.
@@ -77,40 +84,109 @@ class TestFolderObserver(unittest.TestCase):
                 "_wait_for_file_stability",
                 return_value=True,
             ) as mock_wait,
+            patch.object(self.observer, "_executor") as mock_executor,
         ):
             self.observer._observe()  # pylint: disable=protected-access
-            mock_wait.assert_called_once_with("test_folder/new_file.jpg")
+            # Files are reported once their writer closed them
+            command = MockPopen.call_args.args[0]
+            self.assertIn("close_write", command)
+            self.assertIn("moved_to", command)
+            self.assertNotIn("create", command)
+            mock_wait.assert_not_called()
             mock_cache.assert_called_with(
                 yolo_model_filename="yolov8s_101425.pt",
                 classifier_model_filename="colorbw_111325.h5",
                 print_progress=True,
+                warm=False,
             )
 
-            # Verify threading.Thread was called with _handle_new_file
-            # as target
-            MockThread.assert_called_once()
-            call_args = MockThread.call_args
+            # The new file is handed to the bounded handler pool
             # pylint: disable=protected-access
-            self.assertEqual(
-                call_args.kwargs["target"], self.observer._handle_new_file
-            )
-            self.assertEqual(
-                call_args.kwargs["args"],
-                ("test_folder/new_file.jpg",),
+            mock_executor.submit.assert_called_once_with(
+                self.observer._handle_new_file,
+                "test_folder/new_file.jpg",
             )
 
+    @patch("pumaguard.server.acquire_lock")
+    @patch("pumaguard.server.cache_model_two_stage")
+    def test_observe_os_skips_unchanged_folder(
+        self, mock_cache, mock_lock
+    ):  # pylint: disable=unused-argument
+        """
+        The "os" method only lists the folder when its modification time
+        changed.
+        """
+        self.observer.method = "os"
+        stats = iter([100, 100, 100, 200, 200])
+        polls = iter(range(10))
+
+        def fake_sleep(_):
+            if next(polls) >= 3:
+                self.observer._stop_event.set()  # pylint: disable=protected-access
+
+        with (
+            patch(
+                "pumaguard.server.os.stat",
+                side_effect=lambda _: MagicMock(st_mtime_ns=next(stats)),
+            ),
+            patch(
+                "pumaguard.server.os.listdir",
+                side_effect=[["old.jpg"], ["old.jpg", "new.jpg"]],
+            ) as mock_listdir,
+            patch("pumaguard.server.time.sleep", side_effect=fake_sleep),
+            patch.object(
+                self.observer,
+                "_wait_for_file_stability",
+                return_value=True,
+            ),
+            patch.object(self.observer, "_executor") as mock_executor,
+        ):
+            self.observer._observe()  # pylint: disable=protected-access
+
+        self.assertEqual(mock_listdir.call_count, 2)
+        # pylint: disable=protected-access
+        mock_executor.submit.assert_called_once_with(
+            self.observer._handle_new_file,
+            os.path.join(self.folder, "new.jpg"),
+        )
+
     @patch("pumaguard.server.threading.Thread")
     def test_start(self, MockThread):  # pylint: disable=invalid-name
         """
-        Test starting the observer (with monitoring thread).
+        Test starting the observer (with auto-restart).
         """
         self.observer.start()
         MockThread.assert_called_once_with(
-            target=self.observer._monitor_observer,  # pylint: disable=protected-access
-            name=f"Monitor-{self.folder}",
+            target=self.observer._observe_forever,  # pylint: disable=protected-access
+            name=f"Observer-{self.folder}",
         )
         MockThread.return_value.start.assert_called_once()
 
+    def test_observe_forever_restarts_with_backoff(self):
+        """
+        A crashing observer is restarted with a growing delay until the
+        observer is stopped.
+        """
+        # pylint: disable=protected-access
+        stop_event = self.observer._stop_event
+        runs = [RuntimeError("boom"), RuntimeError("boom"), None]
+
+        def observe():
+            result = runs.pop(0)
+            if result is None:
+                stop_event.set()
+            else:
+                raise result
+
+        with (
+            patch.object(self.observer, "_observe", side_effect=observe),
+            patch.object(stop_event, "wait") as mock_wait,
+        ):
+            self.observer._observe_forever()
+
+        self.assertEqual(runs, [])
+        self.assertEqual(mock_wait.call_args_list, [call(1), call(2)])
+
     def test_stop(self):
         """
         Test stopping the observer.
@@ -120,6 +196,21 @@ class TestFolderObserver(unittest.TestCase):
         self.observer.stop()
         self.observer._stop_event.set.assert_called_once()
 
+    def test_stop_shuts_down_executor(self):
+        """
+        Stopping the observer cancels pending files and a restart gets a
+        fresh handler pool.
+        """
+        # pylint: disable=protected-access
+        executor = self.observer._executor
+        self.observer.stop()
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+        with patch("pumaguard.server.threading.Thread"):
+            self.observer.start()
+        self.assertIsNot(self.observer._executor, executor)
+        self.observer._executor.shutdown()
+
     # pylint: enable=protected-access
     @patch("pumaguard.server.classify_image_two_stage", return_value=0.7)
     @patch("pumaguard.server.logger")
@@ -221,6 +312,41 @@ class TestFolderObserver(unittest.TestCase):
         self.assertIn("192.168.52.102", controlled_ips)
         self.assertNotIn("192.168.52.103", controlled_ips)
 
+    @patch("pumaguard.server.classify_image_two_stage", return_value=0.7)
+    @patch("pumaguard.server.playsound")
+    @patch("pumaguard.server.set_shelly_switch")
+    def test_handle_new_file_turns_off_plugs_it_turned_on(
+        self, mock_set_switch, mock_playsound, mock_classify
+    ):  # pylint: disable=unused-argument
+        """
+        The plugs turned on before the sound are the ones turned off after
+        it, even if the plug list changes while the sound plays.
+        """
+        self.mock_webui.plugs = {
+            "aa:bb:cc:dd:ee:01": {
+                "hostname": "plug-auto-1",
+                "ip_address": "192.168.52.101",
+                "mac_address": "aa:bb:cc:dd:ee:01",
+                "status": "connected",
+                "mode": "automatic",
+                "last_seen": "2024-01-15T10:00:00Z",
+            },
+        }
+        mock_set_switch.return_value = (True, {"was_on": False}, None)
+        mock_playsound.side_effect = lambda *_: self.mock_webui.plugs.clear()
+
+        self.observer._handle_new_file(  # pylint: disable=protected-access
+            filepath="fake_puma_image.jpg"
+        )
+
+        self.assertEqual(
+            mock_set_switch.call_args_list,
+            [
+                call("192.168.52.101", True, "plug-auto-1"),
+                call("192.168.52.101", False, "plug-auto-1"),
+            ],
+        )
+
     @patch("pumaguard.server.classify_image_two_stage", return_value=0.3)
     @patch("pumaguard.server.playsound")
     @patch("pumaguard.server.set_shelly_switch")
@@ -305,43 +431,89 @@ class TestFolderObserver(unittest.TestCase):
             self.assertEqual(call_info[0][0], "192.168.52.101")
 
     @patch("pumaguard.server.Image.open")
+    @patch("pumaguard.server.os.stat")
+    @patch("pumaguard.server.FolderObserver._sleep", return_value=None)
     @patch("pumaguard.server.FolderObserver._get_time")
     @patch("pumaguard.server.logger")
     def test_wait_for_file_stability_closed_immediately(
-        self, mock_logger, mock_time, mock_open
+        self, mock_logger, mock_time, mock_sleep, mock_stat, mock_open
     ):
         """
-        If file can be opened immediately, it is considered closed.
+        If the file size does not change between two checks and the header
+        can be read, the file is considered closed.
         """
-        mock_time.side_effect = [0.0, 0.1]
+        mock_time.side_effect = [0.0, 0.1, 0.2]
+        mock_stat.return_value = MagicMock(st_size=1024)
         mock_logger.info = MagicMock()
 
         result = self.observer._wait_for_file_stability(  # pylint: disable=protected-access
             "somepath", timeout=1, interval=0.01
         )
         self.assertEqual(result, True)
+        self.assertEqual(mock_stat.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
         self.assertEqual(mock_open.call_count, 1)
-        self.assertEqual(mock_time.call_count, 2)
+        self.assertEqual(mock_time.call_count, 3)
+        img = mock_open.return_value.__enter__.return_value
+        img.verify.assert_not_called()
         mock_logger.info.assert_called()
 
     @patch("pumaguard.server.Image.open")
+    @patch("pumaguard.server.os.stat")
+    @patch("pumaguard.server.FolderObserver._sleep", return_value=None)
+    @patch("pumaguard.server.FolderObserver._get_time")
+    def test_wait_for_file_stability_growing_file(
+        self, mock_time, mock_sleep, mock_stat, mock_open
+    ):
+        """
+        The header is not read while the file is still growing.
+        """
+        mock_time.side_effect = [0.0, 0.1, 0.2, 0.3, 0.4]
+        mock_stat.side_effect = [
+            MagicMock(st_size=0),
+            MagicMock(st_size=512),
+            MagicMock(st_size=1024),
+            MagicMock(st_size=1024),
+        ]
+
+        # pylint: disable=protected-access
+        result = self.observer._wait_for_file_stability(
+            "somepath", timeout=2, interval=0.01
+        )
+        self.assertEqual(result, True)
+        self.assertEqual(mock_sleep.call_count, 3)
+        self.assertEqual(mock_open.call_count, 1)
+
+    @patch("pumaguard.server.os.stat")
+    def test_wait_for_file_stability_missing_file(self, mock_stat):
+        """
+        A file that disappears is not waited for.
+        """
+        mock_stat.side_effect = FileNotFoundError("gone")
+
+        # pylint: disable=protected-access
+        result = self.observer._wait_for_file_stability(
+            "somepath", timeout=2, interval=0.01
+        )
+        self.assertFalse(result)
+
+    @patch("pumaguard.server.Image.open")
+    @patch("pumaguard.server.os.stat")
     @patch("pumaguard.server.FolderObserver._sleep", return_value=None)
     @patch("pumaguard.server.FolderObserver._get_time")
     def test_wait_for_file_stability_opens_then_closes(
-        self, mock_time, mock_sleep, mock_open
+        self, mock_time, mock_sleep, mock_stat, mock_open
     ):
         """
-        If file raises OSError first then opens successfully,
-        method returns the converted image.
+        If the header raises OSError first then opens successfully,
+        method returns True.
         """
         mock_time.side_effect = [0.0, 0.1, 0.2, 0.3]
+        mock_stat.return_value = MagicMock(st_size=1024)
 
-        # First call raises OSError, second and third calls succeed
-        # (verify + convert)
         mock_open.side_effect = [
             OSError("Image not ready"),
             MagicMock(),
-            MagicMock(),
         ]
 
         # pylint: disable=protected-access
@@ -349,21 +521,23 @@ class TestFolderObserver(unittest.TestCase):
             "somepath", timeout=2, interval=0.01
         )
         self.assertEqual(result, True)
-        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertEqual(mock_sleep.call_count, 2)
         self.assertEqual(mock_open.call_count, 2)
-        self.assertEqual(mock_time.call_count, 3)
+        self.assertEqual(mock_time.call_count, 4)
 
     @patch("pumaguard.server.FolderObserver._get_time")
     @patch("pumaguard.server.FolderObserver._sleep")
+    @patch("pumaguard.server.os.stat")
     @patch("pumaguard.server.Image.open")
     def test_wait_for_file_stability_timeout(
-        self, mock_open, mock_sleep, mock_time
+        self, mock_open, mock_stat, mock_sleep, mock_time
     ):
         """
         If time advances beyond timeout before file can be opened,
-        method returns None.
+        method returns False.
         """
         mock_open.side_effect = OSError("Image not ready")
+        mock_stat.return_value = MagicMock(st_size=1024)
         mock_sleep.return_value = None
 
         # Provide enough time values: start_time, checks in the loop, and
@@ -386,7 +560,7 @@ class TestFolderObserver(unittest.TestCase):
         Test that _wait_for_file_stability handles truncated images correctly.
         It should retry until the image is complete or timeout occurs.
         """
-        mock_time.side_effect = [0.0, 0.1, 0.2]
+        mock_time.side_effect = [0.0, 0.1, 0.2, 0.3]
         mock_sleep.return_value = None
 
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -462,6 +636,230 @@ class TestFolderObserver(unittest.TestCase):
             self.assertFalse(result)
 
 
+class TestCacheModels(unittest.TestCase):
+    """
+    Tests for caching the models once per process.
+    """
+
+    def setUp(self):
+        self.presets = Settings()
+        server._CACHED_MODELS.clear()  # pylint: disable=protected-access
+
+    @patch("pumaguard.server.acquire_lock")
+    @patch("pumaguard.server.cache_model_two_stage")
+    def test_cache_models_once(
+        self, mock_cache, mock_lock
+    ):  # pylint: disable=unused-argument
+        """
+        Models are only cached once per process, unless they are warmed.
+        """
+        cache_models(self.presets, warm=True)
+        cache_models(self.presets)
+        cache_models(self.presets)
+        self.assertEqual(mock_cache.call_count, 1)
+        self.assertTrue(mock_cache.call_args.kwargs["warm"])
+
+        self.presets.yolo_model_filename = "other.pt"
+        cache_models(self.presets)
+        self.assertEqual(mock_cache.call_count, 2)
+
+    @patch("pumaguard.server.acquire_lock")
+    @patch(
+        "pumaguard.server.cache_model_two_stage",
+        side_effect=RuntimeError("download failed"),
+    )
+    def test_cache_models_failure_releases_lock(self, mock_cache, mock_lock):
+        """
+        A failed cache releases the classification lock and is retried on
+        the next call.
+        """
+        with self.assertRaises(RuntimeError):
+            cache_models(self.presets)
+        mock_lock.return_value.release.assert_called_once()
+
+        mock_cache.side_effect = None
+        cache_models(self.presets)
+        self.assertEqual(mock_cache.call_count, 2)
+
+
+class TestObserveOsMethod(unittest.TestCase):
+    """
+    Tests for files the "os" method finds although the folder's
+    modification time did not change.
+    """
+
+    def setUp(self):
+        presets = Settings()
+        presets.file_stabilization_extra_wait = 0
+        self.observer = FolderObserver(
+            "test_folder", "os", presets, MagicMock()
+        )
+        server._CACHED_MODELS.clear()  # pylint: disable=protected-access
+
+    def _observe(self, mtime: int, polls: int) -> MagicMock:
+        """
+        Observe for a number of polls while the folder's modification time
+        stays the same and a new file appears after the first listing.
+        """
+        # pylint: disable=protected-access
+        self.observer._stop_event.clear()
+        sleeps = iter(range(polls))
+
+        def fake_sleep(_):
+            if next(sleeps) == polls - 1:
+                self.observer._stop_event.set()
+
+        with (
+            patch("pumaguard.server.acquire_lock"),
+            patch("pumaguard.server.cache_model_two_stage"),
+            patch(
+                "pumaguard.server.os.stat",
+                return_value=MagicMock(st_mtime_ns=mtime),
+            ),
+            patch(
+                "pumaguard.server.os.listdir",
+                side_effect=[["old.jpg"], ["old.jpg", "new.jpg"]],
+            ),
+            patch("pumaguard.server.time.sleep", side_effect=fake_sleep),
+            patch.object(
+                self.observer,
+                "_wait_for_file_stability",
+                return_value=True,
+            ),
+            patch.object(self.observer, "_executor") as mock_executor,
+        ):
+            self.observer._observe()
+        return mock_executor
+
+    def test_recently_modified_folder_is_listed(self):
+        """
+        A second file created within the same mtime tick is found while
+        the folder's modification time is recent.
+        """
+        mtime = time.time_ns()
+        with patch("pumaguard.server.time.time_ns", return_value=mtime):
+            mock_executor = self._observe(mtime, polls=1)
+
+        # pylint: disable=protected-access
+        mock_executor.submit.assert_called_once_with(
+            self.observer._handle_new_file,
+            os.path.join("test_folder", "new.jpg"),
+        )
+
+    def test_unchanged_folder_is_listed_periodically(self):
+        """
+        The folder is listed every FULL_LISTING_POLLS polls even if its
+        modification time is old and unchanged.
+        """
+        with patch("pumaguard.server.FULL_LISTING_POLLS", 3):
+            mock_executor = self._observe(100, polls=2)
+            mock_executor.submit.assert_not_called()
+            mock_executor = self._observe(100, polls=3)
+
+        mock_executor.submit.assert_called_once()
+
+
+class TestJpegEndMarker(unittest.TestCase):
+    """
+    Tests for the JPEG End Of Image fast path of the stability check.
+    """
+
+    def setUp(self):
+        self.observer = FolderObserver(
+            "test_folder", "os", Settings(), MagicMock()
+        )
+
+    @patch("pumaguard.server.FolderObserver._sleep", return_value=None)
+    def test_wait_for_file_stability_complete_jpeg(self, mock_sleep):
+        """
+        A JPEG ending in its End Of Image marker is complete right away,
+        without waiting for a second size sample.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_file = os.path.join(temp_dir, "test_image.JPG")
+            Image.new("RGB", (10, 10), color="green").save(
+                test_file, format="JPEG"
+            )
+
+            # pylint: disable=protected-access
+            result = self.observer._wait_for_file_stability(
+                test_file, timeout=2, interval=0.01
+            )
+
+        self.assertTrue(result)
+        mock_sleep.assert_not_called()
+
+    @patch("pumaguard.server.FolderObserver._sleep", return_value=None)
+    def test_wait_for_file_stability_jpeg_without_end_marker(self, mock_sleep):
+        """
+        A JPEG without its End Of Image marker waits for its size to be
+        stable.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_file = os.path.join(temp_dir, "test_image.jpg")
+            img_bytes = io.BytesIO()
+            Image.new("RGB", (10, 10), color="green").save(
+                img_bytes, format="JPEG"
+            )
+            with open(test_file, "wb") as f:
+                f.write(img_bytes.getvalue()[:-2])
+
+            # pylint: disable=protected-access
+            result = self.observer._wait_for_file_stability(
+                test_file, timeout=2, interval=0.01
+            )
+
+        self.assertTrue(result)
+        mock_sleep.assert_called_once()
+
+
+class TestMoveInto(unittest.TestCase):
+    """
+    Tests for moving classified files into their folders.
+    """
+
+    def setUp(self):
+        self.observer = FolderObserver(
+            "test_folder", "inotify", Settings(), MagicMock()
+        )
+
+    def test_move_into_existing_folder(self):
+        """
+        Moving into an existing folder does not try to create it.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            src = os.path.join(temp_dir, "image.jpg")
+            with open(src, "wb") as f:
+                f.write(b"data")
+            dest_root = os.path.join(temp_dir, "classified")
+            os.mkdir(dest_root)
+
+            with patch("pumaguard.server.Path.mkdir") as mock_mkdir:
+                # pylint: disable=protected-access
+                dest = self.observer._move_into(src, dest_root)
+
+            mock_mkdir.assert_not_called()
+            self.assertEqual(str(dest), os.path.join(dest_root, "image.jpg"))
+            self.assertTrue(dest.exists())
+            self.assertFalse(os.path.exists(src))
+
+    def test_move_into_missing_folder(self):
+        """
+        A folder that went missing is created again.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            src = os.path.join(temp_dir, "image.jpg")
+            with open(src, "wb") as f:
+                f.write(b"data")
+            dest_root = os.path.join(temp_dir, "classified", "puma")
+
+            # pylint: disable=protected-access
+            dest = self.observer._move_into(src, dest_root)
+
+            self.assertTrue(dest.exists())
+            self.assertFalse(os.path.exists(src))
+
+
 class TestHandleNewFileNotification(unittest.TestCase):
     """
     Tests verifying that image_notification_callback is invoked by
@@ -541,6 +939,33 @@ class TestHandleNewFileNotification(unittest.TestCase):
             event_data["folder"], self.presets.classified_puma_dir
         )
 
+    @patch("pumaguard.server.shutil.move")
+    @patch("pumaguard.server.acquire_lock")
+    @patch("pumaguard.server.classify_image_two_stage", return_value=0.3)
+    def test_lock_released_before_move(
+        self,
+        mock_classify,  # pylint: disable=unused-argument
+        mock_lock,
+        mock_move,
+    ):
+        """
+        The classification lock is released before the image is moved and
+        clients are notified.
+        """
+        lock = mock_lock.return_value
+        lock.time_waited.return_value = 0
+        mock_move.side_effect = lambda *_: lock.release.assert_called_once()
+        self.mock_notification.side_effect = (
+            lambda *_: lock.release.assert_called_once()
+        )
+
+        self.observer._handle_new_file(  # pylint: disable=protected-access
+            filepath="test_folder/other.jpg"
+        )
+
+        mock_move.assert_called_once()
+        self.mock_notification.assert_called_once()
+
     @patch("pumaguard.server.shutil.move", side_effect=OSError("disk full"))
     @patch("pumaguard.server.Path.mkdir")
     @patch("pumaguard.server.classify_image_two_stage", return_value=0.3)
@@ -8,11 +8,20 @@ from unittest.mock import (
 import requests
 
 from pumaguard.shelly_control import (
+    get_shelly_session,
     get_shelly_status,
     set_shelly_switch,
 )
 
 
+def test_get_shelly_session_is_shared():
+    """Test that all Shelly requests share one pooled session."""
+    session = get_shelly_session()
+
+    assert get_shelly_session() is session
+    assert session.get_adapter("http://192.168.1.100/").max_retries.total == 0
+
+
 def test_get_shelly_status_success():
     """Test get_shelly_status returns device info successfully."""
     mock_response = MagicMock()
@@ -24,9 +33,7 @@ def test_get_shelly_status_success():
     }
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, status, error = get_shelly_status("192.168.1.100", "TestPlug")
 
     assert success is True
@@ -39,7 +46,7 @@ def test_get_shelly_status_success():
 def test_get_shelly_status_timeout():
     """Test get_shelly_status handles timeout gracefully."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=requests.exceptions.Timeout(),
     ):
         success, status, error = get_shelly_status(
@@ -55,7 +62,7 @@ def test_get_shelly_status_timeout():
 def test_get_shelly_status_connection_error():
     """Test get_shelly_status handles connection errors."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=requests.exceptions.ConnectionError(),
     ):
         success, status, error = get_shelly_status("192.168.1.100", "TestPlug")
@@ -72,9 +79,7 @@ def test_get_shelly_status_http_error():
         "404 Not Found"
     )
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, status, error = get_shelly_status("192.168.1.100", "TestPlug")
 
     assert success is False
@@ -88,9 +93,7 @@ def test_get_shelly_status_invalid_json():
     mock_response.json.side_effect = ValueError("Invalid JSON")
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, status, error = get_shelly_status("192.168.1.100", "TestPlug")
 
     assert success is False
@@ -102,7 +105,7 @@ def test_get_shelly_status_invalid_json():
 def test_get_shelly_status_request_exception():
     """Test get_shelly_status handles general request exceptions."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=requests.exceptions.RequestException("Network error"),
     ):
         success, status, error = get_shelly_status("192.168.1.100", "TestPlug")
@@ -118,9 +121,7 @@ def test_get_shelly_status_custom_timeout():
     mock_response.json.return_value = {"output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         get_shelly_status("192.168.1.100", "TestPlug", timeout=10)
 
     # Verify timeout parameter was passed
@@ -144,9 +145,7 @@ def test_set_shelly_switch_turn_on():
     mock_response.json.return_value = {"was_on": False, "output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, data, error = set_shelly_switch(
             "192.168.1.100", True, "TestPlug"
         )
@@ -163,9 +162,7 @@ def test_set_shelly_switch_turn_off():
     mock_response.json.return_value = {"was_on": True, "output": False}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, data, error = set_shelly_switch(
             "192.168.1.100", False, "TestPlug"
         )
@@ -179,7 +176,7 @@ def test_set_shelly_switch_turn_off():
 def test_set_shelly_switch_timeout():
     """Test set_shelly_switch handles timeout gracefully."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=requests.exceptions.Timeout(),
     ):
         success, data, error = set_shelly_switch(
@@ -195,7 +192,7 @@ def test_set_shelly_switch_timeout():
 def test_set_shelly_switch_connection_error():
     """Test set_shelly_switch handles connection errors."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=requests.exceptions.ConnectionError(),
     ):
         success, data, error = set_shelly_switch(
@@ -214,9 +211,7 @@ def test_set_shelly_switch_http_error():
         "500 Server Error"
     )
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, data, error = set_shelly_switch(
             "192.168.1.100", True, "TestPlug"
         )
@@ -232,9 +227,7 @@ def test_set_shelly_switch_invalid_json():
     mock_response.json.side_effect = ValueError("Invalid JSON")
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, data, error = set_shelly_switch(
             "192.168.1.100", True, "TestPlug"
         )
@@ -248,7 +241,7 @@ def test_set_shelly_switch_invalid_json():
 def test_set_shelly_switch_request_exception():
     """Test set_shelly_switch handles general request exceptions."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=requests.exceptions.RequestException("Network error"),
     ):
         success, data, error = set_shelly_switch(
@@ -266,9 +259,7 @@ def test_set_shelly_switch_custom_timeout():
     mock_response.json.return_value = {"output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         set_shelly_switch("192.168.1.100", True, "TestPlug", timeout=10)
 
     # Verify timeout parameter was passed
@@ -282,9 +273,7 @@ def test_set_shelly_switch_correct_url_on():
     mock_response.json.return_value = {"output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         set_shelly_switch("192.168.1.100", True, "TestPlug")
 
     # Verify URL contains correct parameters
@@ -301,9 +290,7 @@ def test_set_shelly_switch_correct_url_off():
     mock_response.json.return_value = {"output": False}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         set_shelly_switch("192.168.1.100", False, "TestPlug")
 
     # Verify URL contains correct parameters
@@ -330,9 +317,7 @@ def test_get_shelly_status_correct_url():
     mock_response.json.return_value = {"output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         get_shelly_status("192.168.1.100", "TestPlug")
 
     # Verify URL
@@ -347,9 +332,7 @@ def test_get_shelly_status_with_different_ip():
     mock_response.json.return_value = {"output": False}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         get_shelly_status("10.0.0.50", "AnotherPlug")
 
     called_url = mock_get.call_args[0][0]
@@ -362,9 +345,7 @@ def test_set_shelly_switch_with_different_ip():
     mock_response.json.return_value = {"output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         set_shelly_switch("10.0.0.50", True, "AnotherPlug")
 
     called_url = mock_get.call_args[0][0]
@@ -392,9 +373,7 @@ def test_get_shelly_status_complex_response():
     }
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, status, error = get_shelly_status("192.168.1.100", "TestPlug")
 
     assert success is True
@@ -410,9 +389,7 @@ def test_set_shelly_switch_empty_hostname():
     mock_response.json.return_value = {"output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, data, error = set_shelly_switch("192.168.1.100", True, "")
 
     assert success is True
@@ -426,9 +403,7 @@ def test_get_shelly_status_empty_hostname():
     mock_response.json.return_value = {"output": True}
     mock_response.raise_for_status = MagicMock()
 
-    with patch(
-        "pumaguard.shelly_control.requests.get", return_value=mock_response
-    ):
+    with patch("requests.Session.get", return_value=mock_response):
         success, status, error = get_shelly_status("192.168.1.100", "")
 
     assert success is True
@@ -439,7 +414,7 @@ def test_get_shelly_status_empty_hostname():
 def test_set_shelly_switch_general_exception():
     """Test set_shelly_switch handles unexpected exceptions."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=Exception("Unexpected error"),
     ):
         success, data, error = set_shelly_switch(
@@ -455,7 +430,7 @@ def test_set_shelly_switch_general_exception():
 def test_get_shelly_status_general_exception():
     """Test get_shelly_status handles unexpected exceptions."""
     with patch(
-        "pumaguard.shelly_control.requests.get",
+        "requests.Session.get",
         side_effect=Exception("Unexpected error"),
     ):
         success, status, error = get_shelly_status("192.168.1.100", "TestPlug")
@@ -33,6 +33,7 @@ from pumaguard.utils import (
     get_duration,
     get_md5,
     get_sha256,
+    load_image_rgb,
     prepare_image,
 )
 
@@ -369,6 +370,36 @@ class TestPrepareImage(unittest.TestCase):
                 )
 
 
+class TestLoadImageRgb(unittest.TestCase):
+    """Test load_image_rgb function."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_load_image_rgb_converts_mode(self):
+        """Test that images are converted to RGB."""
+        image_path = os.path.join(self.temp_dir, "gray.png")
+        PIL.Image.new("L", (64, 48), color=128).save(image_path)
+
+        image = load_image_rgb(image_path)
+
+        self.assertEqual(image.mode, "RGB")
+        self.assertEqual(image.size, (64, 48))
+
+    def test_load_image_rgb_missing_file(self):
+        """Test that a missing file raises and resets the truncation flag."""
+        with self.assertRaises(FileNotFoundError):
+            load_image_rgb(os.path.join(self.temp_dir, "missing.jpg"))
+        self.assertFalse(PIL.ImageFile.LOAD_TRUNCATED_IMAGES)
+
+
 class TestCacheModelTwoStage(unittest.TestCase):
     """Test cache_model_two_stage function."""
 